@@ -0,0 +1 @@
+"""Benchmark e test di carico (eseguibili con `python -m bench.<nome>`)"""
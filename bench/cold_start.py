@@ -0,0 +1,85 @@
+"""Benchmark del cold start (binario PyInstaller o sorgenti)
+
+Avvia più volte l'agent con `--headless --startup-check`, che termina appena
+il tracking è avviato, e misura il tempo totale fino all'uscita (per il
+binario one-file include l'estrazione). Fallisce (exit 1) se la mediana
+supera il budget. Su GitHub Actions i tempi vengono aggiunti anche al
+riepilogo del job (GITHUB_STEP_SUMMARY).
+
+Uso:
+    python -m bench.cold_start dist/AgentTracker --runs 5 --budget 3.0
+    python -m bench.cold_start --source --runs 5 --budget 1.0
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+MAIN = os.path.join(os.path.dirname(os.path.dirname(__file__)), "main.py")
+
+
+def write_summary(timings, median, budget):
+    """Aggiunge i tempi al riepilogo del job GitHub Actions, se disponibile"""
+    path = os.environ.get("GITHUB_STEP_SUMMARY")
+    if not path:
+        return
+    status = "✅ entro il budget" if median <= budget else "❌ budget superato"
+    runs = ", ".join(f"{t:.3f}" for t in timings)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(
+            "### Cold start\n\n"
+            "| Mediana | Min | Max | Budget | Esito |\n"
+            "|---|---|---|---|---|\n"
+            f"| {median:.3f} s | {min(timings):.3f} s | {max(timings):.3f} s "
+            f"| {budget:.1f} s | {status} |\n\n"
+            f"Run (s): {runs}\n"
+        )
+
+
+def main(argv=None):
+    """Entry point del benchmark"""
+    parser = argparse.ArgumentParser(description="Cold start dell'agent")
+    parser.add_argument(
+        "binary", nargs="?", default=os.path.join("dist", "AgentTracker")
+    )
+    parser.add_argument(
+        "--source", action="store_true", help="Avvia main.py invece del binario"
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=3.0, help="Secondi (mediana)")
+    args = parser.parse_args(argv)
+
+    command = [sys.executable, MAIN] if args.source else [args.binary]
+    command += ["--headless", "--startup-check"]
+
+    timings = []
+    for run in range(1, args.runs + 1):
+        start = time.perf_counter()
+        result = subprocess.run(
+            command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+        )
+        elapsed = time.perf_counter() - start
+        if result.returncode != 0:
+            print(f"[BENCH] ❌ Avvio fallito (exit {result.returncode})")
+            print(result.stderr)
+            sys.exit(1)
+        timings.append(elapsed)
+        print(f"[BENCH] run {run}: {elapsed:.3f} s")
+
+    median = statistics.median(timings)
+    print(
+        f"[BENCH] cold start mediana {median:.3f} s, min {min(timings):.3f} s, "
+        f"max {max(timings):.3f} s (budget {args.budget:.1f} s)"
+    )
+    write_summary(timings, median, args.budget)
+    if median > args.budget:
+        print("[BENCH] ❌ Budget superato")
+        sys.exit(1)
+    print("[BENCH] ✅ Entro il budget")
+
+
+if __name__ == "__main__":
+    main()
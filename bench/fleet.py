@@ -0,0 +1,256 @@
+"""Simulatore di carico di una flotta di agent sullo schema MongoDB condiviso
+
+Avvia N agent simulati (MongoSyncManager reali, distribuiti su un pool di
+processi) che sincronizzano attività sintetiche ogni `--sync-interval`
+secondi verso un mongod locale. Per ogni N riporta throughput di scrittura,
+latenza dei sync (p50/p99), dimensione degli indici e contesa sui lock.
+
+Da usare solo contro un database di test: con `--keep` assente il database
+indicato viene eliminato prima di ogni scenario.
+
+Uso:
+    python -m bench.fleet --agents 10 50 100 200 --duration 60 --sync-interval 5
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from multiprocessing import get_context
+from typing import Dict, List, Tuple
+
+from config.settings import Config
+from core.mongo_sync import MongoSyncManager, get_client
+
+APPS = [f"App{i}" for i in range(30)]
+TITLES = [f"Finestra {i}" for i in range(200)]
+
+
+def make_config(uri: str, db_name: str, agent: int) -> Config:
+    """Config di un agent simulato, con un client MongoDB dedicato"""
+    config = Config()
+    # appName diverso per agent: client (e pool) separati, visibili in currentOp
+    separator = "&" if "?" in uri else ("?" if uri.count("/") > 2 else "/?")
+    config.MONGO_URI = f"{uri}{separator}appName=agent-sim-{agent}"
+    config.MONGO_DB = db_name
+    config.DEVICE_ID = f"sim-{agent}"
+    config.USERNAME = f"user{agent}"
+    config.DEVICE_NAME = f"sim-host-{agent}"
+    return config
+
+
+def synthetic_records(
+    rng: random.Random, agent: int, first_id: int, start: datetime, count: int
+) -> List[Tuple]:
+    """Record con lo stesso layout della tabella locale `activity`"""
+    records = []
+    for i in range(count):
+        stop = start + timedelta(seconds=rng.randint(5, 600))
+        records.append(
+            (
+                first_id + i,
+                start.isoformat(),
+                stop.isoformat() if i < count - 1 else None,
+                rng.choice(APPS),
+                rng.choice(TITLES),
+                rng.uniform(0, 100),
+                0,
+                f"sim-{agent}",
+                f"user{agent}",
+                rng.uniform(0, 50),
+                rng.uniform(50, 100),
+                rng.randint(50, 500) * 1024 * 1024,
+                rng.randint(500, 900) * 1024 * 1024,
+                rng.randint(0, 2000),
+                rng.randint(0, 300),
+            )
+        )
+        start = stop
+    return records
+
+
+def run_agent(
+    agent: int, args: argparse.Namespace, deadline: float, results: List[Dict]
+):
+    """Ciclo di sync di un singolo agent"""
+    rng = random.Random(args.seed + agent)
+    manager = MongoSyncManager(make_config(args.uri, args.db, agent))
+    latencies, docs, errors = [], 0, 0
+    next_id, clock = 1, datetime.now(timezone.utc)
+
+    manager.sync_device()
+    # Avvio sfasato, come agent accesi in momenti diversi
+    time.sleep(rng.uniform(0, args.sync_interval))
+
+    while time.time() < deadline:
+        started = time.monotonic()
+        records = synthetic_records(rng, agent, next_id, clock, args.events_per_sync)
+        next_id += len(records)
+        clock = datetime.fromisoformat(records[-1][1]) + timedelta(seconds=30)
+        try:
+            t0 = time.perf_counter()
+            synced = manager.sync_activities(records, f"sim-{agent}")
+            latencies.append(time.perf_counter() - t0)
+            docs += len(synced)
+            errors += len(records) - len(synced)
+        except Exception:
+            errors += len(records)
+        time.sleep(max(0.0, args.sync_interval - (time.monotonic() - started)))
+
+    results.append({"latencies": latencies, "docs": docs, "errors": errors})
+
+
+def run_worker(agents: List[int], args: argparse.Namespace, deadline: float) -> Dict:
+    """Processo del pool: esegue i suoi agent su thread separati"""
+    results: List[Dict] = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        threads = [
+            threading.Thread(target=run_agent, args=(agent, args, deadline, results))
+            for agent in agents
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    return {
+        "latencies": [lat for r in results for lat in r["latencies"]],
+        "docs": sum(r["docs"] for r in results),
+        "errors": sum(r["errors"] for r in results),
+    }
+
+
+def server_status(db) -> Dict:
+    """Contatori del server utili a stimare throughput e contesa"""
+    status = db.client.admin.command("serverStatus")
+    waits = sum(
+        sum(lock.get("acquireWaitCount", {}).values())
+        for lock in status.get("locks", {}).values()
+    )
+    wait_us = sum(
+        sum(lock.get("timeAcquiringMicros", {}).values())
+        for lock in status.get("locks", {}).values()
+    )
+    return {
+        "inserts": status["opcounters"]["insert"],
+        "updates": status["opcounters"]["update"],
+        "lock_waits": waits,
+        "lock_wait_us": wait_us,
+        "queue": status["globalLock"]["currentQueue"]["total"],
+    }
+
+
+def index_sizes(db, collections: List[str]) -> Dict[str, int]:
+    """Dimensione totale degli indici (byte) per collection"""
+    sizes = {}
+    for name in collections:
+        try:
+            stats = next(
+                db[name].aggregate([{"$collStats": {"storageStats": {}}}]), None
+            )
+            sizes[name] = stats["storageStats"]["totalIndexSize"] if stats else 0
+        except Exception:
+            sizes[name] = db.command("collStats", name).get("totalIndexSize", 0)
+    return sizes
+
+
+def run_scenario(agents: int, args: argparse.Namespace) -> Dict:
+    """Esegue uno scenario con `agents` agent simulati"""
+    config = make_config(args.uri, args.db, -1)
+    db = get_client(config)[args.db]
+    if not args.keep:
+        db.client.drop_database(args.db)
+
+    processes = min(agents, args.processes)
+    groups = [list(range(i, agents, processes)) for i in range(processes)]
+    # Orologio di sistema: la scadenza è condivisa tra processi
+    deadline = time.time() + args.duration + args.sync_interval
+
+    # Campiona la coda di attesa sui lock durante lo scenario
+    queue_max, stop = [0], threading.Event()
+
+    def sample_queue():
+        while not stop.wait(1.0):
+            queue_max[0] = max(queue_max[0], server_status(db)["queue"])
+
+    before = server_status(db)
+    sampler = threading.Thread(target=sample_queue, daemon=True)
+    sampler.start()
+    started = time.monotonic()
+
+    with ProcessPoolExecutor(processes, mp_context=get_context("spawn")) as pool:
+        outcomes = list(
+            pool.map(run_worker, groups, [args] * processes, [deadline] * processes)
+        )
+
+    elapsed = time.monotonic() - started
+    stop.set()
+    after = server_status(db)
+    latencies = sorted(lat for o in outcomes for lat in o["latencies"])
+
+    return {
+        "agents": agents,
+        "docs_s": sum(o["docs"] for o in outcomes) / elapsed,
+        "server_writes_s": (
+            after["inserts"] - before["inserts"] + after["updates"] - before["updates"]
+        )
+        / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0,
+        "p99_ms": (
+            statistics.quantiles(latencies, n=100)[98] * 1000
+            if len(latencies) >= 2
+            else 0
+        ),
+        "errors": sum(o["errors"] for o in outcomes),
+        "lock_waits": after["lock_waits"] - before["lock_waits"],
+        "lock_wait_ms": (after["lock_wait_us"] - before["lock_wait_us"]) / 1000,
+        "queue_max": queue_max[0],
+        "indexes": index_sizes(
+            db,
+            [
+                config.ACTIVITY_LOGS_TABLE,
+                config.PROCESS_WINDOW_TABLE,
+                config.DEVICES_TABLE,
+            ],
+        ),
+    }
+
+
+def main(argv=None):
+    """Entry point del simulatore"""
+    parser = argparse.ArgumentParser(description="Carico di una flotta di agent")
+    parser.add_argument("--uri", default="mongodb://localhost:27017")
+    parser.add_argument("--db", default="agent_tracker_load")
+    parser.add_argument("--agents", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--duration", type=float, default=60.0, help="Secondi")
+    parser.add_argument("--sync-interval", type=float, default=5.0)
+    parser.add_argument("--events-per-sync", type=int, default=20)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--keep", action="store_true", help="Non eliminare il database tra scenari"
+    )
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'agent':>6} {'doc/s':>8} {'write/s':>8} {'p50 ms':>8} {'p99 ms':>8} "
+        f"{'errori':>7} {'lock wait':>9} {'wait ms':>8} {'coda max':>8}  indici KB"
+    )
+    for agents in args.agents:
+        r = run_scenario(agents, args)
+        indexes = ", ".join(f"{k}={v / 1024:.0f}" for k, v in r["indexes"].items())
+        print(
+            f"{r['agents']:>6} {r['docs_s']:>8.0f} {r['server_writes_s']:>8.0f} "
+            f"{r['p50_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['errors']:>7} "
+            f"{r['lock_waits']:>9} {r['lock_wait_ms']:>8.1f} {r['queue_max']:>8}  "
+            f"{indexes}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Confronto di RSS e CPU a riposo tra modalità daemon e modalità con GUI
+
+Avvia `main.py` in ciascuna modalità, attende il warm-up e poi misura RSS e
+CPU consumata durante la finestra di osservazione. Richiede un `.env`
+valido (e un display per la modalità con GUI).
+
+Uso:
+    python -m bench.footprint --warmup 10 --duration 60
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import psutil
+
+MODES = {
+    "headless": ["--headless"],
+    "standalone": [],
+}
+
+MAIN = os.path.join(os.path.dirname(os.path.dirname(__file__)), "main.py")
+
+
+def measure(args, warmup: float, duration: float):
+    """Ritorna (rss MB, CPU % a riposo) del processo avviato con `args`"""
+    proc = subprocess.Popen(
+        [sys.executable, MAIN, *args],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        time.sleep(warmup)
+        ps = psutil.Process(proc.pid)
+        start = ps.cpu_times()
+        time.sleep(duration)
+        end = ps.cpu_times()
+        rss = ps.memory_info().rss / 1024 / 1024
+    finally:
+        proc.terminate()
+        proc.wait(10)
+
+    cpu = (end.user - start.user + end.system - start.system) / duration
+    return rss, cpu
+
+
+def main(argv=None):
+    """Entry point del benchmark"""
+    parser = argparse.ArgumentParser(description="RSS e CPU a riposo per modalità")
+    parser.add_argument("--warmup", type=float, default=10.0)
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES)
+    args = parser.parse_args(argv)
+
+    for mode in args.modes:
+        rss, cpu = measure(MODES[mode], args.warmup, args.duration)
+        print(f"[BENCH] {mode:10} RSS {rss:6.1f} MB  CPU a riposo {cpu:.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Benchmark del costo dei callback di input con un flood sintetico di eventi
+
+Simula i movimenti del mouse (e opzionalmente tasti/click) inviati dai
+listener di pynput e misura il carico CPU stimato alla frequenza indicata.
+I movimenti vengono confrontati tra il vecchio callback (time.time() a ogni
+evento) e il polling del puntatore, che costa una lettura per controllo di
+inattività qualunque sia la frequenza degli eventi (qui una lettura simulata:
+quella reale interroga il server grafico, ma resta una per controllo).
+
+Uso:
+    python -m bench.input_flood --events 1000000 --rate 1000 --counts
+"""
+
+import argparse
+import time
+
+from core.input_monitor import InputMonitor
+
+
+class _LegacyCallback:
+    """Callback precedente: time.time() e scrittura a ogni evento"""
+
+    def __init__(self):
+        self.last_input = time.time()
+
+    def on_input(self, *args, **kwargs):
+        self.last_input = time.time()
+
+
+class _MovingPointer:
+    """Puntatore che si sposta a ogni lettura, come durante un flood di movimenti"""
+
+    def __init__(self):
+        self.x = 0
+
+    @property
+    def position(self):
+        self.x += 1
+        return self.x, 20
+
+
+def _measure(callback, events: int, *args) -> float:
+    """Ritorna i secondi CPU per evento"""
+    start = time.thread_time()
+    for _ in range(events):
+        callback(*args)
+    return (time.thread_time() - start) / events
+
+
+def main(argv=None):
+    """Entry point del benchmark"""
+    parser = argparse.ArgumentParser(description="Flood di eventi di input")
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--rate", type=int, default=1000, help="Eventi al secondo")
+    parser.add_argument("--throttle-ms", type=int, default=100)
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=30.0,
+        help="Secondi tra due controlli di inattività (TRACKING_INTERVAL)",
+    )
+    parser.add_argument("--counts", action="store_true")
+    args = parser.parse_args(argv)
+
+    monitor = InputMonitor(args.throttle_ms / 1000, args.counts)
+    monitor._pointer = _MovingPointer()
+
+    # (secondi CPU per chiamata, chiamate al secondo)
+    results = {
+        "legacy (move)": (
+            _measure(_LegacyCallback().on_input, args.events, 10, 20),
+            args.rate,
+        ),
+        "polling (move)": (
+            _measure(monitor.poll_pointer, args.events),
+            1 / args.poll_interval,
+        ),
+    }
+    if args.counts:
+        results["counted (key)"] = (
+            _measure(monitor._on_key, args.events, "a"),
+            args.rate,
+        )
+        results["counted (click)"] = (
+            _measure(monitor._on_click, args.events, 10, 20, "left", True),
+            args.rate,
+        )
+
+    for name, (per_call, calls) in results.items():
+        print(
+            f"[BENCH] {name:16} {per_call * 1e9:7.1f} ns/chiamata, "
+            f"{calls:g} chiamate/s con {args.rate} ev/s: CPU {per_call * calls:.6%}"
+        )
+    if args.counts:
+        print(f"[BENCH] contatori: {monitor.take_counts()}")
+
+
+if __name__ == "__main__":
+    main()
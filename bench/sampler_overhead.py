@@ -0,0 +1,68 @@
+"""Benchmark dell'overhead del ResourceSampler
+
+Campiona il processo corrente per la durata indicata e fallisce (exit 1) se
+il costo CPU del campionamento supera il budget.
+
+Uso:
+    python -m bench.sampler_overhead --duration 30 --interval 1.0 --budget 0.01
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+from core.sampler import ResourceSampler
+
+
+def main(argv=None):
+    """Entry point del benchmark"""
+    parser = argparse.ArgumentParser(description="Overhead del ResourceSampler")
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--budget", type=float, default=0.01)
+    parser.add_argument("--iterations", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    sampler = ResourceSampler(args.interval, args.budget)
+    sampler.switch(os.getpid())
+
+    # Costo del singolo campionamento
+    sampler.sample()
+    start = time.thread_time()
+    for _ in range(args.iterations):
+        sampler.sample()
+    per_sample = (time.thread_time() - start) / args.iterations
+    sampler.switch(os.getpid())
+
+    # Overhead a regime, misurato sul thread del sampler
+    cpu = {}
+
+    def run():
+        start = time.thread_time()
+        deadline = time.monotonic() + args.duration
+        while time.monotonic() < deadline:
+            sampler.sample()
+            time.sleep(sampler.interval)
+        cpu["sampler"] = time.thread_time() - start
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join()
+
+    overhead = cpu["sampler"] / args.duration
+    stats = sampler.switch(None) or {}
+
+    print(f"[BENCH] costo per campione: {per_sample * 1e6:.1f} µs")
+    print(f"[BENCH] overhead a regime: {overhead:.4%} (budget {args.budget:.2%})")
+    print(f"[BENCH] sessione: {stats}")
+
+    if overhead > args.budget:
+        print("[BENCH] ❌ Budget superato")
+        sys.exit(1)
+    print("[BENCH] ✅ Entro il budget")
+
+
+if __name__ == "__main__":
+    main()
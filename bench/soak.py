@@ -0,0 +1,216 @@
+"""Soak test: giorni di utilizzo simulati in pochi minuti
+
+Riproduce una traccia di cambi di focus (da CSV `process,window_title` o
+sintetica) attraverso tracker, database, retention e GUI, simulando anche
+sync, cambi di livello e toast. Durante l'esecuzione registra RSS, numero di
+thread, widget Tk e dimensione del file SQLite; fallisce (exit 1) se dopo il
+warm-up crescono oltre i limiti. Richiede un display per Tk.
+
+Uso:
+    python -m bench.soak --days 3 --switch-every 30
+    python -m bench.soak --trace focus.csv --days 7
+"""
+
+import argparse
+import contextlib
+import csv
+import itertools
+import os
+import random
+import sys
+import tempfile
+import threading
+from types import SimpleNamespace
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import psutil
+
+from config.settings import Config
+from core.database import DatabaseManager
+from core.retention import RetentionManager
+from core.sampler import ResourceSampler
+from core.tracker import ActivityTracker
+from gui.manager import GUIManager
+
+# Frequenza (in eventi di focus) delle interazioni simulate
+SYNC_EVERY = 20
+LEVEL_CHANGE_EVERY = 5
+TOAST_EVERY = 200
+RETENTION_EVERY = 500
+
+
+class ReplayBackend:
+    """Sostituisce MongoSyncManager: registra processi e cambi di livello"""
+
+    def __init__(self):
+        self.apps: Dict[Tuple[str, str], Dict] = {}
+        self.focus: Tuple[str, str] = ("unknown", "Unknown")
+        self.level_updates = 0
+
+    def register(self, process: str, window_title: str) -> Optional[Dict]:
+        """Ritorna il documento del processo se non era ancora noto"""
+        if (process, window_title) in self.apps:
+            return None
+        app = {
+            "_id": len(self.apps) + 1,
+            "process": process,
+            "window_title": window_title,
+            "level": 5,
+        }
+        self.apps[(process, window_title)] = app
+        return app
+
+    def get_process_windows(self) -> List[Dict]:
+        return list(self.apps.values())
+
+    def update_level(self, voce_id, level: int):
+        self.level_updates += 1
+
+    def get_active_window(self) -> Tuple[str, str]:
+        return self.focus
+
+
+def synthetic_trace(apps: int, seed: int) -> Iterator[Tuple[str, str]]:
+    """Traccia sintetica: pochi processi molto usati, molti titoli rari"""
+    rng = random.Random(seed)
+    names = [(f"App{i % 25}", f"Finestra {i}") for i in range(apps)]
+    weights = [1 / (i + 1) for i in range(apps)]
+    while True:
+        yield rng.choices(names, weights)[0]
+
+
+def load_trace(path: str) -> Iterator[Tuple[str, str]]:
+    """Traccia da CSV `process,window_title`, ripetuta all'infinito"""
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = [(r[0], r[1]) for r in csv.reader(f) if len(r) >= 2]
+    return itertools.cycle(rows)
+
+
+def widget_count(widget) -> int:
+    """Conta ricorsivamente i widget Tk"""
+    return 1 + sum(widget_count(child) for child in widget.winfo_children())
+
+
+def db_size(path: str) -> int:
+    return sum(os.path.getsize(p) for p in (path, path + "-wal") if os.path.exists(p))
+
+
+def main(argv=None):
+    """Entry point del soak test"""
+    parser = argparse.ArgumentParser(description="Soak test dell'agent")
+    parser.add_argument("--days", type=float, default=3.0, help="Giorni simulati")
+    parser.add_argument(
+        "--switch-every", type=float, default=30.0, help="Secondi simulati tra eventi"
+    )
+    parser.add_argument("--trace", help="CSV process,window_title da riprodurre")
+    parser.add_argument("--apps", type=int, default=400, help="Finestre sintetiche")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--samples", type=int, default=20)
+    parser.add_argument("--warmup", type=float, default=0.25, help="Frazione")
+    parser.add_argument("--max-rss-growth-mb", type=float, default=20.0)
+    parser.add_argument("--max-thread-growth", type=int, default=2)
+    parser.add_argument("--max-db-mb", type=float, default=8.0)
+    parser.add_argument("--max-rows", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="agent-soak-")
+    config = Config()
+    config.DB_PATH = os.path.join(workdir, "activity.db")
+    config.ARCHIVE_DIR = os.path.join(workdir, "archive")
+    config.RETENTION_DAYS = 0  # archivia subito tutto ciò che è sincronizzato
+    config.GUI_MAX_ROWS = args.max_rows
+
+    backend = ReplayBackend()
+    db_manager = DatabaseManager(config.DB_PATH)
+    retention = RetentionManager(config, db_manager)
+    sampler = ResourceSampler(config.SAMPLE_INTERVAL, config.SAMPLER_CPU_BUDGET)
+    tracker = ActivityTracker(config, db_manager, backend, sampler)
+    gui = GUIManager(config, backend, backend.get_active_window)
+    root = gui.create_window()
+    threading.Thread(target=sampler.sampling_loop, daemon=True).start()
+
+    trace = (
+        load_trace(args.trace) if args.trace else synthetic_trace(args.apps, args.seed)
+    )
+    events = int(args.days * 86400 / args.switch_every)
+    sample_every = max(1, events // args.samples)
+    rng = random.Random(args.seed)
+    proc = psutil.Process()
+    pending: List[Dict] = []
+    history = []
+
+    print(f"[SOAK] {events} eventi ({args.days} giorni simulati) in {workdir}")
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for i in range(1, events + 1):
+            process, window_title = next(trace)
+            backend.focus = (process, window_title)
+            tracker.track_event(process, window_title, os.getpid())
+
+            app = backend.register(process, window_title)
+            if app:
+                pending.append(app)
+
+            if i % SYNC_EVERY == 0:
+                db_manager.mark_as_synced()
+                for app in pending:
+                    gui.add_process(app)
+                pending.clear()
+
+            if i % LEVEL_CHANGE_EVERY == 0 and gui.indicators:
+                app_id = rng.choice(list(gui.indicators))
+                scale = gui.indicators[app_id]["scale"]
+                scale.set(rng.randint(1, 10))
+                gui._on_level_change(SimpleNamespace(widget=scale), app_id)
+
+            if i % TOAST_EVERY == 0:
+                gui.show_toast("Soak test")
+
+            if i % RETENTION_EVERY == 0:
+                retention.archive_batch()
+
+            root.update()
+
+            if i % sample_every == 0:
+                history.append(
+                    {
+                        "event": i,
+                        "rss_mb": proc.memory_info().rss / 1024 / 1024,
+                        "threads": threading.active_count(),
+                        "widgets": widget_count(root),
+                        "db_mb": db_size(config.DB_PATH) / 1024 / 1024,
+                    }
+                )
+
+    print(f"{'evento':>8} {'RSS MB':>8} {'thread':>7} {'widget':>7} {'DB MB':>7}")
+    for h in history:
+        print(
+            f"{h['event']:>8} {h['rss_mb']:>8.1f} {h['threads']:>7} "
+            f"{h['widgets']:>7} {h['db_mb']:>7.2f}"
+        )
+
+    baseline = history[int(len(history) * args.warmup)]
+    final = history[-1]
+    # 3 widget per riga, più la finestra con titolo, pulsante, toast e paginazione
+    max_widgets = 3 * args.max_rows + 10
+    failures = []
+    if final["rss_mb"] - baseline["rss_mb"] > args.max_rss_growth_mb:
+        failures.append(
+            f"RSS +{final['rss_mb'] - baseline['rss_mb']:.1f} MB dopo il warm-up"
+        )
+    if final["threads"] - baseline["threads"] > args.max_thread_growth:
+        failures.append(f"thread +{final['threads'] - baseline['threads']}")
+    if max(h["widgets"] for h in history) > max_widgets:
+        failures.append(f"widget oltre {max_widgets}")
+    if max(h["db_mb"] for h in history) > args.max_db_mb:
+        failures.append(f"DB oltre {args.max_db_mb} MB")
+
+    print(f"[SOAK] cambi di livello inviati: {backend.level_updates}")
+    if failures:
+        print(f"[SOAK] ❌ {'; '.join(failures)}")
+        sys.exit(1)
+    print("[SOAK] ✅ Nessuna crescita oltre i limiti")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,11 +5,17 @@ import sys
 from pathlib import Path
 import uuid
 import platform
+from functools import cached_property
 from dotenv import load_dotenv
 
 
 class Config:
-    """Configurazione centralizzata"""
+    """Configurazione centralizzata
+
+    La costruzione legge solo `.env` e le variabili d'ambiente: non solleva
+    eccezioni né esegue operazioni lente. I valori obbligatori vanno
+    verificati con `validate()` prima dell'uso.
+    """
 
     def __init__(self):
         BASE_DIR = Path(
@@ -23,11 +29,41 @@ class Config:
         self.DB_PATH = os.path.expanduser(os.getenv("DB_PATH", "~/activity.db"))
         self.MONGO_URI = os.getenv("MONGO_URI")
         self.MONGO_DB = os.getenv("MONGO_DB", "productivity")
+        self.MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "zstd,snappy,zlib")
+        self.MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "10"))
+        self.MONGO_TIMEOUT_MS = int(os.getenv("MONGO_TIMEOUT_MS", "10000"))
+
+        # Sync a batch: dimensione e batch in volo contemporaneamente
+        self.SYNC_BATCH_SIZE = int(os.getenv("SYNC_BATCH_SIZE", "500"))
+        self.SYNC_MAX_IN_FLIGHT = int(os.getenv("SYNC_MAX_IN_FLIGHT", "4"))
+
+        # Socket locale tra daemon e GUI
+        self.IPC_SOCKET = os.path.expanduser(
+            os.getenv("IPC_SOCKET", "~/.agent-tracker.sock")
+        )
 
         # Intervals (seconds)
         self.SYNC_INTERVAL = int(os.getenv("SYNC_INTERVAL", "300"))
         self.TRACKING_INTERVAL = int(os.getenv("TRACKING_INTERVAL", "30"))
         self.INACTIVITY_THRESHOLD = 60
+        self.INPUT_THROTTLE_MS = int(os.getenv("INPUT_THROTTLE_MS", "100"))
+        self.INPUT_COUNTS = os.getenv("INPUT_COUNTS", "0").lower() in ("1", "true")
+        self.SAMPLE_INTERVAL = float(os.getenv("SAMPLE_INTERVAL", "1.0"))
+
+        # Budget CPU del campionamento (frazione di un core)
+        self.SAMPLER_CPU_BUDGET = float(os.getenv("SAMPLER_CPU_BUDGET", "0.01"))
+
+        # Retention dei record sincronizzati
+        self.RETENTION_DAYS = int(os.getenv("RETENTION_DAYS", "30"))
+        self.RETENTION_MODE = os.getenv("RETENTION_MODE", "archive")  # o "delete"
+        self.RETENTION_INTERVAL = int(os.getenv("RETENTION_INTERVAL", "3600"))
+        self.RETENTION_BATCH_SIZE = int(os.getenv("RETENTION_BATCH_SIZE", "500"))
+        self.ARCHIVE_DIR = os.path.expanduser(
+            os.getenv("ARCHIVE_DIR", "~/activity_archive")
+        )
+
+        # GUI: righe per pagina dell'elenco applicazioni (nessuna riga viene rimossa)
+        self.GUI_MAX_ROWS = int(os.getenv("GUI_MAX_ROWS", "200"))
 
         # Tables
         self.ACTIVITY_LOGS_TABLE = "activity_logs"
@@ -35,7 +71,6 @@ class Config:
         self.DEVICES_TABLE = "devices"
 
         # Device info
-        self.DEVICE_ID = str(uuid.getnode())
         self.USERNAME = os.getenv("USERNAME") or os.getenv("USER") or "unknown"
         self.SYSTEM = platform.system()
         self.DEVICE_NAME = platform.node()
@@ -53,7 +88,13 @@ class Config:
             "python",
         ]
 
-        # Validation
+    @cached_property
+    def DEVICE_ID(self) -> str:
+        # uuid.getnode() può essere lento (interroga le interfacce di rete)
+        return str(uuid.getnode())
+
+    def validate(self):
+        """Verifica la configurazione necessaria alla sincronizzazione"""
         if not self.MONGO_URI:
             raise ValueError("❌ MONGO_URI mancante. Inseriscilo in .env")
 
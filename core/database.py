@@ -1,13 +1,24 @@
 """Gestione database SQLite locale"""
 
 import sqlite3
-from typing import List, Tuple
-from datetime import datetime, timezone
+import uuid
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from datetime import datetime, time, timedelta, timezone
 
 
 class DatabaseManager:
     """Gestisce le operazioni sul database SQLite locale"""
 
+    # Metriche di sessione salvate alla chiusura di un'attività
+    SESSION_COLUMNS = {
+        "cpu_mean": "REAL",
+        "cpu_max": "REAL",
+        "rss_mean": "INTEGER",
+        "rss_max": "INTEGER",
+        "keystrokes": "INTEGER",
+        "clicks": "INTEGER",
+    }
+
     def __init__(self, db_path: str):
         self.db_path = db_path
         self._init_database()
@@ -16,6 +27,12 @@ class DatabaseManager:
         """Inizializza il database con le tabelle necessarie"""
         conn = sqlite3.connect(self.db_path)
         cur = conn.cursor()
+
+        # Abilita il vacuum incrementale (migrazione una tantum dei DB esistenti)
+        if cur.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            cur.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            cur.execute("VACUUM")
+
         cur.execute(
             """
             CREATE TABLE IF NOT EXISTS activity (
@@ -31,9 +48,59 @@ class DatabaseManager:
             )
         """
         )
+        # Colonne aggiunte successivamente (migrazione dei DB esistenti)
+        existing = {row[1] for row in cur.execute("PRAGMA table_info(activity)")}
+        # last_seen: ultimo controllo del tracker con l'attività ancora aperta
+        added_columns = {**self.SESSION_COLUMNS, "last_seen": "TIMESTAMP"}
+        for column, column_type in added_columns.items():
+            if column not in existing:
+                cur.execute(f"ALTER TABLE activity ADD COLUMN {column} {column_type}")
+
+        # Riepilogo giornaliero (giorno locale × processo × titolo)
+        summary_exists = cur.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'activity_daily'"
+        ).fetchone()
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS activity_daily (
+                day TEXT NOT NULL,
+                process TEXT NOT NULL,
+                window_title TEXT NOT NULL,
+                seconds REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (day, process, window_title)
+            ) WITHOUT ROWID
+        """
+        )
+        # Stato interno (chiave/valore), es. fin dove arrivano i record archiviati
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            ) WITHOUT ROWID
+        """
+        )
+        # Ricerca rapida dell'ultima attività aperta
+        cur.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_activity_open
+            ON activity (start_time) WHERE stop_time IS NULL
+        """
+        )
+        # Selezione dei record sincronizzati da archiviare
+        cur.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_activity_synced_start
+            ON activity (synced, start_time)
+        """
+        )
         conn.commit()
         conn.close()
 
+        # DB esistente: il riepilogo nasce dai record già presenti
+        if not summary_exists:
+            self.rebuild_daily_summary()
+
     def insert_activity(
         self,
         process: str,
@@ -41,26 +108,45 @@ class DatabaseManager:
         cpu_percent: float,
         device_id: str,
         username: str,
+        closed_stats: Optional[Dict[str, float]] = None,
     ):
-        """Inserisce un nuovo record di attività"""
+        """Inserisce un nuovo record di attività
+
+        `closed_stats` contiene le metriche di sessione (vedi SESSION_COLUMNS)
+        da salvare sull'attività precedente, che viene chiusa e torna da
+        sincronizzare anche se era già stata inviata aperta.
+        """
         conn = sqlite3.connect(self.db_path)
         cur = conn.cursor()
         start_time = datetime.now(timezone.utc).isoformat()  # TEMP
-        cur.execute(
-            """
-            UPDATE activity
-            SET stop_time = ?
-            WHERE id = (
-                SELECT id FROM activity
-                WHERE synced = 0 AND stop_time IS NULL
+
+        try:
+            # Chiudi l'attività precedente e aggiorna il riepilogo
+            last_open = cur.execute(
+                """
+                SELECT id, start_time, process, window_title FROM activity
+                WHERE stop_time IS NULL
                 ORDER BY start_time DESC
                 LIMIT 1
-            )
-            """,
-            (start_time,),
-        )
+                """
+            ).fetchone()
+
+            if last_open:
+                stats = {
+                    k: v
+                    for k, v in (closed_stats or {}).items()
+                    if k in self.SESSION_COLUMNS
+                }
+                assignments = "".join(f", {column} = ?" for column in stats)
+                cur.execute(
+                    f"UPDATE activity SET stop_time = ?, synced = 0{assignments} "
+                    "WHERE id = ?",
+                    (start_time, *stats.values(), last_open[0]),
+                )
+                self._add_to_daily_summary(
+                    cur, last_open[1], start_time, last_open[2], last_open[3]
+                )
 
-        try:
             cur.execute(
                 """
                     INSERT INTO activity (
@@ -83,6 +169,51 @@ class DatabaseManager:
         finally:
             conn.close()
 
+    def touch_open_activity(self):
+        """Registra che l'attività aperta è ancora in corso (last_seen)"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute(
+                "UPDATE activity SET last_seen = ? WHERE stop_time IS NULL",
+                (datetime.now(timezone.utc).isoformat(),),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def close_open_activities(self, grace: float) -> int:
+        """Chiude le attività rimaste aperte da un'esecuzione precedente
+
+        Lo stop è l'ultimo `last_seen` (o l'inizio, per i record che non lo
+        hanno) più `grace` secondi, mai oltre l'istante attuale: il tempo in
+        cui l'agent era spento non viene attribuito all'attività.
+        """
+        conn = sqlite3.connect(self.db_path)
+        cur = conn.cursor()
+        now = datetime.now(timezone.utc)
+        try:
+            rows = cur.execute(
+                """
+                SELECT id, start_time, last_seen, process, window_title FROM activity
+                WHERE stop_time IS NULL
+                """
+            ).fetchall()
+            for activity_id, start_time, last_seen, process, window_title in rows:
+                start = datetime.fromisoformat(start_time)
+                seen = datetime.fromisoformat(last_seen) if last_seen else start
+                stop = max(start, min(now, seen + timedelta(seconds=grace)))
+                cur.execute(
+                    "UPDATE activity SET stop_time = ?, synced = 0 WHERE id = ?",
+                    (stop.isoformat(), activity_id),
+                )
+                self._add_to_daily_summary(
+                    cur, start_time, stop.isoformat(), process, window_title
+                )
+            conn.commit()
+            return len(rows)
+        finally:
+            conn.close()
+
     def get_unsynced_records(self) -> List[Tuple]:
         """Recupera tutti i record non sincronizzati"""
         conn = sqlite3.connect(self.db_path)
@@ -92,12 +223,236 @@ class DatabaseManager:
         finally:
             conn.close()
 
-    def mark_as_synced(self):
-        """Marca tutti i record come sincronizzati"""
+    def mark_as_synced(
+        self, ids: Optional[Iterable[int]] = None, open_ids: Iterable[int] = ()
+    ):
+        """Marca come sincronizzati i record indicati (tutti se `ids` è None)
+
+        `open_ids` sono i record inviati quando erano ancora aperti: se nel
+        frattempo sono stati chiusi restano da sincronizzare.
+        """
+        conn = sqlite3.connect(self.db_path)
+        cur = conn.cursor()
+        try:
+            if ids is None:
+                cur.execute("UPDATE activity SET synced = 1 WHERE synced = 0")
+            else:
+                open_ids = set(open_ids)
+                cur.executemany(
+                    "UPDATE activity SET synced = 1 WHERE id = ? AND stop_time IS NULL",
+                    [(i,) for i in ids if i in open_ids],
+                )
+                cur.executemany(
+                    "UPDATE activity SET synced = 1 WHERE id = ?",
+                    [(i,) for i in ids if i not in open_ids],
+                )
+            conn.commit()
+        finally:
+            conn.close()
+
+    # === Retention ===
+
+    def get_archivable_records(self, before: str, limit: int) -> List[Dict]:
+        """Recupera i record sincronizzati e chiusi iniziati prima di `before`"""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        cur = conn.cursor()
+        try:
+            rows = cur.execute(
+                """
+                SELECT * FROM activity
+                WHERE synced = 1 AND stop_time IS NOT NULL AND start_time < ?
+                ORDER BY id
+                LIMIT ?
+                """,
+                (before, limit),
+            ).fetchall()
+            return [dict(row) for row in rows]
+        finally:
+            conn.close()
+
+    def delete_records(self, ids: Iterable[int], archived_until: Optional[str] = None):
+        """Elimina i record indicati
+
+        `archived_until` è lo stop più recente tra i record rimossi: viene
+        salvato (se più recente del precedente) nella stessa transazione.
+        """
+        conn = sqlite3.connect(self.db_path)
+        cur = conn.cursor()
+        try:
+            cur.executemany("DELETE FROM activity WHERE id = ?", [(i,) for i in ids])
+            if archived_until:
+                previous = self._get_meta(cur, "archived_until")
+                if previous is None or datetime.fromisoformat(
+                    archived_until
+                ) > datetime.fromisoformat(previous):
+                    self._set_meta(cur, "archived_until", archived_until)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get_install_id(self) -> str:
+        """Id casuale di questa installazione, generato al primo utilizzo
+
+        Distingue i record di DB diversi sullo stesso device (es. più utenti
+        dello stesso PC), che hanno id locali sovrapposti.
+        """
         conn = sqlite3.connect(self.db_path)
         cur = conn.cursor()
         try:
-            cur.execute("UPDATE activity SET synced = 1 WHERE synced = 0")
+            cur.execute(
+                "INSERT OR IGNORE INTO meta (key, value) VALUES ('install_id', ?)",
+                (uuid.uuid4().hex,),
+            )
+            conn.commit()
+            return self._get_meta(cur, "install_id")
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _get_meta(cur: sqlite3.Cursor, key: str) -> Optional[str]:
+        row = cur.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _set_meta(cur: sqlite3.Cursor, key: str, value: str):
+        cur.execute(
+            """
+            INSERT INTO meta (key, value) VALUES (?, ?)
+            ON CONFLICT (key) DO UPDATE SET value = excluded.value
+            """,
+            (key, value),
+        )
+
+    def incremental_vacuum(self, pages: int = 0):
+        """Restituisce al filesystem fino a `pages` pagine libere (0 = tutte)"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute(f"PRAGMA incremental_vacuum({int(pages)})").fetchall()
+        finally:
+            conn.close()
+
+    # === Riepilogo giornaliero ===
+
+    @staticmethod
+    def _split_by_day(start: datetime, stop: datetime) -> Iterator[Tuple[str, float]]:
+        """Suddivide un intervallo in (giorno locale, secondi) a mezzanotte
+
+        La mezzanotte è calcolata nel fuso locale di ciascun giorno, così i
+        giorni con cambio dell'ora legale durano 23 o 25 ore.
+        """
+        start, stop = start.astimezone(), stop.astimezone()
+        while start < stop:
+            midnight = datetime.combine(
+                start.date() + timedelta(days=1), time()
+            ).astimezone()
+            end = min(stop, midnight)
+            yield start.date().isoformat(), (end - start).total_seconds()
+            start = end
+
+    def _add_to_daily_summary(
+        self,
+        cur: sqlite3.Cursor,
+        start_time: str,
+        stop_time: str,
+        process: Optional[str],
+        window_title: Optional[str],
+        since: Optional[str] = None,
+    ):
+        """Aggiunge la durata di un'attività chiusa al riepilogo giornaliero
+
+        Con `since` vengono considerati solo i giorni da `since` in poi.
+        """
+        try:
+            start = datetime.fromisoformat(start_time)
+            stop = datetime.fromisoformat(stop_time)
+        except (TypeError, ValueError):
+            return
+
+        cur.executemany(
+            """
+            INSERT INTO activity_daily (day, process, window_title, seconds)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (day, process, window_title)
+            DO UPDATE SET seconds = seconds + excluded.seconds
+            """,
+            [
+                (day, process or "", window_title or "", seconds)
+                for day, seconds in self._split_by_day(start, stop)
+                if since is None or day >= since
+            ],
+        )
+
+    def get_daily_summary(
+        self, start_day: str, end_day: Optional[str] = None
+    ) -> List[Tuple[str, str, str, float]]:
+        """Ritorna (day, process, window_title, seconds) tra due giorni inclusi"""
+        conn = sqlite3.connect(self.db_path)
+        cur = conn.cursor()
+        try:
+            return cur.execute(
+                """
+                SELECT day, process, window_title, seconds FROM activity_daily
+                WHERE day BETWEEN ? AND ?
+                ORDER BY day, seconds DESC
+                """,
+                (start_day, end_day or start_day),
+            ).fetchall()
+        finally:
+            conn.close()
+
+    def get_process_totals(
+        self, start_day: str, end_day: Optional[str] = None
+    ) -> List[Tuple[str, float]]:
+        """Ritorna (process, seconds) aggregati tra due giorni inclusi"""
+        conn = sqlite3.connect(self.db_path)
+        cur = conn.cursor()
+        try:
+            return cur.execute(
+                """
+                SELECT process, SUM(seconds) AS total FROM activity_daily
+                WHERE day BETWEEN ? AND ?
+                GROUP BY process
+                ORDER BY total DESC
+                """,
+                (start_day, end_day or start_day),
+            ).fetchall()
+        finally:
+            conn.close()
+
+    def rebuild_daily_summary(self):
+        """Ricostruisce il riepilogo giornaliero dai record grezzi
+
+        I giorni fino a quello in cui termina l'ultimo record archiviato o
+        eliminato dalla retention (`archived_until`) vengono mantenuti così
+        come sono: i loro record grezzi non sono più tutti nel DB.
+        """
+        conn = sqlite3.connect(self.db_path)
+        cur = conn.cursor()
+        try:
+            rows = cur.execute(
+                """
+                SELECT start_time, stop_time, process, window_title FROM activity
+                WHERE stop_time IS NOT NULL
+                ORDER BY start_time
+                """
+            ).fetchall()
+            if not rows:
+                return
+
+            archived_until = self._get_meta(cur, "archived_until")
+            if archived_until:
+                last_archived = datetime.fromisoformat(archived_until).astimezone()
+                first_day = last_archived.date() + timedelta(days=1)
+            else:
+                first_day = datetime.fromisoformat(rows[0][0]).astimezone().date()
+            since = first_day.isoformat()
+
+            cur.execute("DELETE FROM activity_daily WHERE day >= ?", (since,))
+            for start_time, stop_time, process, window_title in rows:
+                self._add_to_daily_summary(
+                    cur, start_time, stop_time, process, window_title, since
+                )
             conn.commit()
         finally:
             conn.close()
@@ -0,0 +1,95 @@
+"""Monitoraggio input utente (mouse e tastiera)"""
+
+import time
+from typing import Dict
+
+_monotonic = time.monotonic
+
+
+class InputMonitor:
+    """Registra l'ultimo input con un lavoro minimo per evento
+
+    I movimenti del mouse non hanno callback (ne arriverebbero centinaia al
+    secondo): `poll_pointer` confronta la posizione del puntatore a ogni
+    controllo di inattività. Tasti, click e scroll passano dai listener di
+    pynput e aggiornano il timestamp al massimo una volta ogni `throttle`
+    secondi. Se `count_events` è attivo conta anche tasti premuti e click; i
+    contatori crescono sempre e `take_counts` restituisce la differenza
+    rispetto alla lettura precedente, così i listener non devono mai azzerarli.
+    """
+
+    def __init__(self, throttle: float = 0.1, count_events: bool = False):
+        self.throttle = throttle
+        self.count_events = count_events
+        self.last_input = _monotonic()
+        self._next_update = self.last_input + throttle
+        self.keystrokes = 0
+        self.clicks = 0
+        self._taken = (0, 0)
+        self._pointer = None
+        self._last_position = None
+        self.available = True
+
+    def start(self):
+        """Avvia i listener per mouse e tastiera"""
+        try:
+            from pynput import keyboard, mouse
+        except ImportError as e:
+            # Es. macchina senza display: l'utente viene considerato sempre attivo
+            print(f"[WARN] Input listener non disponibili: {e}")
+            self.available = False
+            return
+
+        on_click = self._on_click if self.count_events else self._on_input
+        on_press = self._on_key if self.count_events else self._on_input
+
+        self._pointer = mouse.Controller()
+        self._last_position = self._pointer.position
+        mouse.Listener(on_click=on_click, on_scroll=self._on_input).start()
+        keyboard.Listener(on_press=on_press).start()
+
+    def poll_pointer(self):
+        """Registra un input se il puntatore si è spostato dall'ultima lettura"""
+        if self._pointer is None:
+            return
+        try:
+            position = self._pointer.position
+        except Exception:
+            return
+        if position != self._last_position:
+            self._last_position = position
+            self.last_input = _monotonic()
+
+    def _on_input(self, *args):
+        """Callback per attività input"""
+        now = _monotonic()
+        if now >= self._next_update:
+            self.last_input = now
+            self._next_update = now + self.throttle
+
+    def _on_click(self, x, y, button, pressed):
+        """Callback per click del mouse (con conteggio)"""
+        if pressed:
+            self.clicks += 1
+        self._on_input()
+
+    def _on_key(self, key):
+        """Callback per tasti premuti (con conteggio)"""
+        self.keystrokes += 1
+        self._on_input()
+
+    def idle_seconds(self) -> float:
+        """Secondi trascorsi dall'ultimo input"""
+        if not self.available:
+            return 0.0
+        return _monotonic() - self.last_input
+
+    def take_counts(self) -> Dict[str, int]:
+        """Ritorna tasti e click dall'ultima chiamata"""
+        keystrokes, clicks = self.keystrokes, self.clicks
+        last_keystrokes, last_clicks = self._taken
+        self._taken = (keystrokes, clicks)
+        return {
+            "keystrokes": keystrokes - last_keystrokes,
+            "clicks": clicks - last_clicks,
+        }
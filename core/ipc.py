@@ -0,0 +1,243 @@
+"""Comunicazione locale tra daemon di tracking e GUI (socket Unix)
+
+Protocollo: un messaggio JSON per riga.
+    daemon → GUI: {"type": "apps", "apps": [...]}
+                  {"type": "process", "app": {...}}
+                  {"type": "focus", "process": ..., "window_title": ...}
+    GUI → daemon: {"type": "set_level", "id": ..., "level": ...}
+"""
+
+import atexit
+import json
+import os
+import queue
+import socket
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from config.settings import Config
+
+# Attesa massima della lista iniziale di applicazioni dal daemon (secondi)
+APPS_TIMEOUT = 10
+# Messaggi in coda per GUI: oltre questo limite il client è considerato bloccato
+CLIENT_QUEUE_SIZE = 100
+
+
+def _send(sock: socket.socket, message: Dict):
+    sock.sendall((json.dumps(message) + "\n").encode("utf-8"))
+
+
+def _serialize_app(app: Dict) -> Dict:
+    """Rende serializzabile un documento process_windows (ObjectId → str)"""
+    return {**app, "_id": str(app["_id"])}
+
+
+class IPCServer:
+    """Espone focus e processi del daemon alle GUI collegate
+
+    Ogni GUI ha una coda di uscita e un thread di scrittura: tracking e sync
+    non aspettano mai i client, e quelli che non leggono vengono scollegati.
+    """
+
+    def __init__(self, config: Config, mongo_manager):
+        self.config = config
+        self.mongo_manager = mongo_manager
+        self.socket_path = config.IPC_SOCKET
+        self._server: Optional[socket.socket] = None
+        self._clients: Dict[socket.socket, queue.Queue] = {}
+        self._lock = threading.Lock()
+        self._focus: Tuple[str, str] = ("unknown", "Unknown")
+
+    def start(self):
+        """Apre il socket e avvia il thread di accettazione
+
+        Solleva RuntimeError se sul socket risponde già un altro daemon.
+        """
+        if os.path.exists(self.socket_path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.socket_path)
+            except OSError:
+                # Socket rimasto da un daemon terminato
+                os.unlink(self.socket_path)
+            else:
+                raise RuntimeError(f"Un daemon è già in ascolto su {self.socket_path}")
+            finally:
+                probe.close()
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        server.listen()
+        self._server = server
+        atexit.register(self.stop)
+
+        threading.Thread(target=self._accept_loop, args=(server,), daemon=True).start()
+        print(f"[IPC] In ascolto su {self.socket_path}")
+
+    def stop(self):
+        """Chiude il socket e lo rimuove dal filesystem"""
+        if self._server is None:
+            return
+        self._server.close()
+        self._server = None
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+    def _accept_loop(self, server: socket.socket):
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                break
+            threading.Thread(
+                target=self._handle_client, args=(conn,), daemon=True
+            ).start()
+
+    def _handle_client(self, conn: socket.socket):
+        """Invia lo stato iniziale e gestisce i comandi della GUI"""
+        registered = False
+        try:
+            apps = [_serialize_app(a) for a in self.mongo_manager.get_process_windows()]
+            outbox: queue.Queue = queue.Queue(CLIENT_QUEUE_SIZE)
+            outbox.put({"type": "apps", "apps": apps})
+            with self._lock:
+                process, window_title = self._focus
+                outbox.put(
+                    {"type": "focus", "process": process, "window_title": window_title}
+                )
+                self._clients[conn] = outbox
+                registered = True
+            threading.Thread(
+                target=self._write_loop, args=(conn, outbox), daemon=True
+            ).start()
+
+            for line in conn.makefile("r", encoding="utf-8"):
+                message = json.loads(line)
+                if message.get("type") == "set_level":
+                    from bson import ObjectId
+
+                    self.mongo_manager.update_level(
+                        ObjectId(message["id"]), int(message["level"])
+                    )
+        except Exception as e:
+            # Errori di un client già scollegato dal daemon non vanno segnalati
+            if not registered or conn in self._clients:
+                print(f"[IPC ERROR] {e}")
+        finally:
+            self._remove_client(conn)
+
+    def _write_loop(self, conn: socket.socket, outbox: queue.Queue):
+        """Invia alla GUI i messaggi in coda (None = chiusura)"""
+        try:
+            while True:
+                message = outbox.get()
+                if message is None:
+                    break
+                _send(conn, message)
+        except OSError:
+            pass
+        finally:
+            self._remove_client(conn)
+
+    def _remove_client(self, conn: socket.socket):
+        with self._lock:
+            outbox = self._clients.pop(conn, None)
+        if outbox is None:
+            return
+        try:
+            outbox.put_nowait(None)
+        except queue.Full:
+            pass
+        # Sblocca un eventuale invio in corso del thread di scrittura
+        try:
+            conn.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        conn.close()
+
+    def _broadcast(self, message: Dict):
+        # Accodamento sotto lock: tracking e sync non devono intercalare le righe
+        stalled = []
+        with self._lock:
+            for conn, outbox in self._clients.items():
+                try:
+                    outbox.put_nowait(message)
+                except queue.Full:
+                    stalled.append(conn)
+        for conn in stalled:
+            print("[IPC] GUI non risponde, disconnessa")
+            self._remove_client(conn)
+
+    def publish_focus(self, process: str, window_title: str):
+        """Notifica alle GUI il cambio di finestra attiva"""
+        self._focus = (process, window_title)
+        self._broadcast(
+            {"type": "focus", "process": process, "window_title": window_title}
+        )
+
+    def add_process(self, app: Dict):
+        """Notifica alle GUI un nuovo processo sincronizzato"""
+        self._broadcast({"type": "process", "app": _serialize_app(app)})
+
+
+class IPCClient:
+    """Client GUI collegato al daemon: sostituisce MongoSyncManager"""
+
+    def __init__(self, config: Config):
+        self.config = config
+        self.socket_path = config.IPC_SOCKET
+        self.gui = None
+        self._sock: Optional[socket.socket] = None
+        self._apps: List[Dict] = []
+        self._apps_ready = threading.Event()
+        self._focus: Tuple[str, str] = ("unknown", "Unknown")
+
+    def connect(self):
+        """Si collega al daemon e avvia il thread di lettura"""
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.connect(self.socket_path)
+        threading.Thread(target=self._read_loop, daemon=True).start()
+        print(f"[IPC] Collegato a {self.socket_path}")
+
+    def _connected(self) -> socket.socket:
+        if self._sock is None:
+            raise ConnectionError("IPC non collegato")
+        return self._sock
+
+    def _read_loop(self):
+        try:
+            for line in self._connected().makefile("r", encoding="utf-8"):
+                message = json.loads(line)
+                kind = message.get("type")
+                if kind == "focus":
+                    self._focus = (message["process"], message["window_title"])
+                elif kind == "apps":
+                    self._apps = message["apps"]
+                    self._apps_ready.set()
+                elif kind == "process" and self.gui:
+                    self.gui.add_process(message["app"])
+        except Exception as e:
+            print(f"[IPC ERROR] {e}")
+        print("[IPC] Connessione al daemon chiusa")
+
+    def get_process_windows(self) -> List[Dict]:
+        """Ritorna i processi/finestre ricevuti dal daemon"""
+        self._apps_ready.wait(APPS_TIMEOUT)
+        return self._apps
+
+    def get_active_window(self) -> Tuple[str, str]:
+        """Ritorna l'ultima finestra attiva notificata dal daemon"""
+        return self._focus
+
+    def update_level(self, voce_id, level: int):
+        """Inoltra al daemon il cambio di livello"""
+        try:
+            _send(
+                self._connected(),
+                {"type": "set_level", "id": str(voce_id), "level": level},
+            )
+        except OSError as e:
+            print(f"[SET LEVEL ERROR] {e}")
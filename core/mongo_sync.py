@@ -1,11 +1,64 @@
 """Sincronizzazione con MongoDB"""
 
-import pymongo
-from typing import List, Tuple, Dict
+import importlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, List, Tuple, Dict
 from config.settings import Config
 from datetime import datetime, timezone
-from pymongo import ReturnDocument
-from pymongo import DESCENDING
+
+# pymongo viene importato al primo utilizzo, non all'avvio dell'app
+if TYPE_CHECKING:
+    import pymongo
+
+# Modulo Python richiesto da ciascun compressore di rete
+COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+
+# Un solo client (e pool di connessioni) per URI in tutto il processo
+_clients: Dict[str, "pymongo.MongoClient"] = {}
+_clients_lock = threading.Lock()
+
+
+def available_compressors(requested: str) -> List[str]:
+    """Filtra i compressori richiesti tenendo quelli con la libreria installata"""
+    compressors = []
+    for name in (c.strip() for c in requested.split(",")):
+        module = COMPRESSOR_MODULES.get(name)
+        if not module:
+            continue
+        try:
+            importlib.import_module(module)
+            compressors.append(name)
+        except ImportError:
+            pass
+    return compressors
+
+
+def get_client(config: Config) -> "pymongo.MongoClient":
+    """Ritorna il client condiviso, configurato con pool, timeout e compressione
+
+    La compressione viene negoziata con il server: se non supporta nessuno dei
+    compressori offerti, i messaggi viaggiano non compressi.
+    """
+    import pymongo
+
+    with _clients_lock:
+        client = _clients.get(config.MONGO_URI)
+        if client is None:
+            compressors = available_compressors(config.MONGO_COMPRESSORS)
+            client = pymongo.MongoClient(
+                config.MONGO_URI,
+                compressors=compressors or None,
+                maxPoolSize=config.MONGO_MAX_POOL_SIZE,
+                connectTimeoutMS=config.MONGO_TIMEOUT_MS,
+                serverSelectionTimeoutMS=config.MONGO_TIMEOUT_MS,
+                socketTimeoutMS=config.MONGO_TIMEOUT_MS,
+                retryWrites=True,
+            )
+            _clients[config.MONGO_URI] = client
+            print(f"[MONGO] Compressori offerti: {', '.join(compressors) or 'nessuno'}")
+        return client
 
 
 class MongoSyncManager:
@@ -13,17 +66,45 @@ class MongoSyncManager:
 
     def __init__(self, config: Config, gui_manager=None):
         self.config = config
-        self.client = pymongo.MongoClient(config.MONGO_URI)
-        self.db = self.client[config.MONGO_DB]
         self.gui = gui_manager
-        self._init_indexes()
+        self._db = None
+        self._db_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=config.SYNC_MAX_IN_FLIGHT, thread_name_prefix="mongo-sync"
+        )
+        self._in_flight = threading.BoundedSemaphore(config.SYNC_MAX_IN_FLIGHT)
 
-    def _init_indexes(self):
+    @property
+    def db(self):
+        """Database MongoDB: client e indici vengono preparati al primo accesso"""
+        if self._db is None:
+            with self._db_lock:
+                if self._db is None:
+                    db = get_client(self.config)[self.config.MONGO_DB]
+                    self._init_indexes(db)
+                    self._db = db
+        return self._db
+
+    def _init_indexes(self, db):
         """Crea gli indici necessari"""
-        self.db[self.config.PROCESS_WINDOW_TABLE].create_index(
+        from pymongo.errors import OperationFailure
+
+        db[self.config.PROCESS_WINDOW_TABLE].create_index(
             [("device_id", 1), ("process", 1), ("window_title", 1)], unique=True
         )
-        self.db[self.config.DEVICES_TABLE].create_index([("device_id", 1)], unique=True)
+        db[self.config.DEVICES_TABLE].create_index([("device_id", 1)], unique=True)
+        # Un documento per record locale (i log precedenti non hanno local_id)
+        logs = db[self.config.ACTIVITY_LOGS_TABLE]
+        try:
+            # Sostituito dall'indice con install_id
+            logs.drop_index("device_id_1_local_id_1")
+        except OperationFailure:
+            pass
+        logs.create_index(
+            [("device_id", 1), ("install_id", 1), ("local_id", 1)],
+            unique=True,
+            partialFilterExpression={"local_id": {"$exists": True}},
+        )
 
     def sync_device(self):
         """Sincronizza le informazioni del device"""
@@ -44,22 +125,57 @@ class MongoSyncManager:
         except Exception as e:
             print(f"[DEVICE SYNC ERROR] {e}")
 
-    def close_last_open_activity(self, stop_time):
-        last_open = self.db[self.config.ACTIVITY_LOGS_TABLE].find_one(
-            {"stop_time": None, "device_id": self.config.DEVICE_ID},
-            sort=[("start_time", -1)],
-        )
+    def _write_batch(self, ids: List[int], docs: List[Dict]):
+        """Scrive un batch e ritorna (ids, byte BSON, latenza in secondi)
 
-        if last_open:
-            self.db[self.config.ACTIVITY_LOGS_TABLE].update_one(
-                {"_id": last_open["_id"]},
-                {"$set": {"stop_time": stop_time}},
-            )
+        Ogni record è un upsert su (device_id, install_id, local_id): un
+        record reinviato (es. chiuso dopo essere stato sincronizzato aperto)
+        aggiorna il documento esistente invece di duplicarlo. Se alcune scritture del
+        batch falliscono vengono ritornati solo gli id scritti.
+        """
+        try:
+            import bson
+            from pymongo import UpdateOne
+            from pymongo.errors import BulkWriteError
 
-    def sync_activities(self, records: List[Tuple]):
-        """Sincronizza i record di attività"""
+            size = sum(len(bson.encode(doc)) for doc in docs)
+            requests = [
+                UpdateOne(
+                    {
+                        "device_id": doc["device_id"],
+                        "install_id": doc["install_id"],
+                        "local_id": doc["local_id"],
+                    },
+                    {"$set": doc},
+                    upsert=True,
+                )
+                for doc in docs
+            ]
+            start = time.perf_counter()
+            try:
+                self.db[self.config.ACTIVITY_LOGS_TABLE].bulk_write(
+                    requests, ordered=False
+                )
+            except BulkWriteError as e:
+                errors = e.details.get("writeErrors", [])
+                failed = {error["index"] for error in errors}
+                ids = [id_ for i, id_ in enumerate(ids) if i not in failed]
+                print(
+                    f"[SYNC BATCH ERROR] {len(failed)} record non scritti: "
+                    f"{errors[0]['errmsg'] if errors else e}"
+                )
+            return ids, size, time.perf_counter() - start
+        finally:
+            self._in_flight.release()
+
+    def sync_activities(self, records: List[Tuple], install_id: str) -> List[int]:
+        """Sincronizza i record di attività, ritorna gli id locali inviati
+
+        `install_id` identifica il DB locale di provenienza (vedi
+        DatabaseManager.get_install_id).
+        """
         if not records:
-            return
+            return []
 
         def parse_ts(ts: str | None):
             if ts is None:
@@ -68,6 +184,8 @@ class MongoSyncManager:
 
         docs = [
             {
+                "local_id": r[0],
+                "install_id": install_id,
                 "start_time": parse_ts(r[1]),
                 "stop_time": parse_ts(r[2]),
                 "process": r[3],
@@ -75,49 +193,107 @@ class MongoSyncManager:
                 "cpu_percent": r[5],
                 "device_id": r[7],
                 "username": r[8],
+                "cpu_mean": r[9],
+                "cpu_max": r[10],
+                "rss_mean": r[11],
+                "rss_max": r[12],
+                "keystrokes": r[13],
+                "clicks": r[14],
             }
             for r in records
         ]
 
-        # Chiudi ultima attività aperta
-        self.close_last_open_activity(docs[0]["start_time"])
-
-        # Inserisci attività
-        self.db[self.config.ACTIVITY_LOGS_TABLE].insert_many(docs)
+        # Scrivi le attività a batch, con al massimo SYNC_MAX_IN_FLIGHT in volo
+        batch_size = self.config.SYNC_BATCH_SIZE
+        futures = []
+        for i in range(0, len(docs), batch_size):
+            self._in_flight.acquire()
+            futures.append(
+                self._executor.submit(
+                    self._write_batch,
+                    [r[0] for r in records[i : i + batch_size]],
+                    docs[i : i + batch_size],
+                )
+            )
 
-        # Aggiorna tabella processi
-        for doc in docs:
+        synced_ids: List[int] = []
+        sizes, latencies = [], []
+        for future in futures:
             try:
-                if doc["process"] in self.config.PROCESS_BLACKLIST:
-                    continue
+                ids, size, latency = future.result()
+                synced_ids.extend(ids)
+                sizes.append(size)
+                latencies.append(latency)
+            except Exception as e:
+                print(f"[SYNC BATCH ERROR] {e}")
 
-                result = self.db[self.config.PROCESS_WINDOW_TABLE].find_one_and_update(
-                    {
-                        "device_id": doc["device_id"],
-                        "process": doc["process"],
-                        "window_title": doc["window_title"],
-                    },
-                    {
-                        "$setOnInsert": {
-                            "device_id": doc["device_id"],
-                            "process": doc["process"],
-                            "window_title": doc["window_title"],
-                            "level": 5,
-                            "active": True,
-                        }
-                    },
-                    upsert=True,
-                    return_document=ReturnDocument.AFTER,
-                )
+        # Aggiorna tabella processi (una volta per processo/finestra)
+        self._upsert_process_windows(docs)
 
-                if self.gui:
-                    row = len(self.gui.indicators) + 1
-                    self.gui.add_process_row(row, result)
+        if latencies:
+            print(
+                f"[SYNC] {len(synced_ids)}/{len(docs)} record sincronizzati in "
+                f"{len(latencies)} batch, {sum(sizes) / 1024:.1f} KB BSON, "
+                f"latenza batch media {sum(latencies) / len(latencies) * 1000:.0f} ms "
+                f"/ max {max(latencies) * 1000:.0f} ms"
+            )
+        return synced_ids
 
-            except Exception as e:
-                print(f"[PROCESS UPSERT ERROR] {e}")
+    def _upsert_process_windows(self, docs: List[Dict]):
+        """Registra processi/finestre in un solo bulk write
+
+        Alla GUI vengono notificati solo quelli inseriti ora: gli altri li ha
+        già caricati all'avvio o ricevuti da un sync precedente.
+        """
+        from pymongo import UpdateOne
+        from pymongo.errors import BulkWriteError
+
+        windows: Dict[Tuple[str, str, str], Dict] = {}
+        for doc in docs:
+            if doc["process"] in self.config.PROCESS_BLACKLIST:
+                continue
+            key = (doc["device_id"], doc["process"], doc["window_title"])
+            windows.setdefault(
+                key,
+                {
+                    "device_id": doc["device_id"],
+                    "process": doc["process"],
+                    "window_title": doc["window_title"],
+                    "level": 5,
+                    "active": True,
+                },
+            )
+        if not windows:
+            return
+
+        window_docs = list(windows.values())
+        requests = [
+            UpdateOne(
+                {
+                    "device_id": window["device_id"],
+                    "process": window["process"],
+                    "window_title": window["window_title"],
+                },
+                {"$setOnInsert": window},
+                upsert=True,
+            )
+            for window in window_docs
+        ]
+        try:
+            result = self.db[self.config.PROCESS_WINDOW_TABLE].bulk_write(
+                requests, ordered=False
+            )
+            upserted = result.upserted_ids.items()
+        except BulkWriteError as e:
+            print(f"[PROCESS UPSERT ERROR] {e}")
+            upserted = ((u["index"], u["_id"]) for u in e.details.get("upserted", []))
+        except Exception as e:
+            print(f"[PROCESS UPSERT ERROR] {e}")
+            return
 
-        print(f"[SYNC] {len(docs)} record sincronizzati")
+        if self.gui:
+            for index, _id in upserted:
+                self.gui.add_process({"_id": _id, **window_docs[index]})
 
     def get_process_windows(self) -> List[Dict]:
         """Recupera i processi/finestre dal database"""
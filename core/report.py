@@ -0,0 +1,84 @@
+"""Report locale del tempo speso per applicazione
+
+Uso:
+    python -m core.report                       # oggi
+    python -m core.report --day 2026-10-18
+    python -m core.report --from 2026-01-01 --to 2026-10-19
+    python -m core.report --rebuild             # ricostruisce il riepilogo
+    python -m core.report --archived --from 2025-01-01 --to 2025-01-31
+"""
+
+import argparse
+from datetime import date, datetime
+
+from config.settings import config
+from core.database import DatabaseManager
+from core.retention import RetentionManager
+
+
+def format_seconds(seconds: float) -> str:
+    """Formatta una durata come HH:MM:SS"""
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def main(argv=None):
+    """Entry point del report"""
+    parser = argparse.ArgumentParser(description="Tempo speso per applicazione")
+    parser.add_argument("--day", help="Giorno (YYYY-MM-DD), default oggi")
+    parser.add_argument("--from", dest="start_day", help="Primo giorno (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="end_day", help="Ultimo giorno (YYYY-MM-DD)")
+    parser.add_argument(
+        "--detail", action="store_true", help="Mostra il dettaglio per finestra"
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Ricostruisce il riepilogo dai record grezzi",
+    )
+    parser.add_argument(
+        "--archived",
+        action="store_true",
+        help="Legge i record grezzi dagli archivi della retention",
+    )
+    args = parser.parse_args(argv)
+
+    db_manager = DatabaseManager(config.DB_PATH)
+
+    if args.rebuild:
+        db_manager.rebuild_daily_summary()
+        print("[REPORT] Riepilogo ricostruito")
+
+    start_day = args.start_day or args.day or date.today().isoformat()
+    end_day = args.end_day or args.day or start_day
+
+    print(f"[REPORT] {start_day} → {end_day}")
+
+    if args.archived:
+        retention = RetentionManager(config, db_manager)
+        totals = {}
+        for record in retention.query_archives(start_day, end_day):
+            if not record["stop_time"]:
+                continue
+            seconds = (
+                datetime.fromisoformat(record["stop_time"])
+                - datetime.fromisoformat(record["start_time"])
+            ).total_seconds()
+            totals[record["process"]] = totals.get(record["process"], 0) + seconds
+        for process, seconds in sorted(totals.items(), key=lambda t: -t[1]):
+            print(f"{format_seconds(seconds)}  {process}")
+        return
+
+    if args.detail:
+        for day, process, window_title, seconds in db_manager.get_daily_summary(
+            start_day, end_day
+        ):
+            print(f"{day}  {format_seconds(seconds)}  {process} ({window_title})")
+        return
+
+    for process, seconds in db_manager.get_process_totals(start_day, end_day):
+        print(f"{format_seconds(seconds)}  {process}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Retention, archiviazione e compattazione dei record sincronizzati"""
+
+import gzip
+import json
+import os
+import time
+import zlib
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional
+
+from config.settings import Config
+from core.database import DatabaseManager
+
+# Pausa tra un batch e l'altro, per non contendere il DB con il tracking
+BATCH_PAUSE = 0.5
+# Pagine liberate dal vacuum incrementale dopo ogni batch
+VACUUM_PAGES_PER_BATCH = 256
+# Intestazione di un membro gzip (magic + metodo deflate)
+GZIP_MAGIC = b"\x1f\x8b\x08"
+
+
+class RetentionManager:
+    """Sposta i record sincronizzati più vecchi in archivi compressi"""
+
+    def __init__(self, config: Config, db_manager: DatabaseManager):
+        self.config = config
+        self.db_manager = db_manager
+        self.archive_dir = config.ARCHIVE_DIR
+
+    def _archive_path(self, month: str) -> str:
+        return os.path.join(self.archive_dir, f"activity-{month}.jsonl.gz")
+
+    def _write_archive(self, records: List[Dict]):
+        """Accoda i record agli archivi mensili (un membro gzip per batch)
+
+        Il membro viene compresso in memoria e accodato con una sola scrittura;
+        un membro troncato da un crash viene saltato in lettura.
+        """
+        by_month: Dict[str, List[Dict]] = {}
+        for record in records:
+            by_month.setdefault(record["start_time"][:7], []).append(record)
+
+        os.makedirs(self.archive_dir, exist_ok=True)
+        for month, month_records in by_month.items():
+            member = gzip.compress(
+                "".join(json.dumps(r) + "\n" for r in month_records).encode("utf-8")
+            )
+            with open(self._archive_path(month), "ab") as f:
+                f.write(member)
+                f.flush()
+                os.fsync(f.fileno())
+
+    @staticmethod
+    def _read_archive(path: str) -> Iterator[str]:
+        """Righe JSON di un archivio, saltando i membri gzip danneggiati"""
+        with open(path, "rb") as f:
+            data = f.read()
+
+        pos = 0
+        while pos < len(data):
+            decompressor = zlib.decompressobj(wbits=31)
+            try:
+                text = decompressor.decompress(data[pos:])
+                if not decompressor.eof:
+                    raise zlib.error("membro troncato")
+            except zlib.error as e:
+                print(f"[RETENTION WARN] {path}: membro danneggiato saltato ({e})")
+                # Riprende dall'intestazione gzip successiva
+                pos = data.find(GZIP_MAGIC, pos + 1)
+                if pos < 0:
+                    return
+                continue
+
+            yield from text.decode("utf-8").splitlines()
+            pos = len(data) - len(decompressor.unused_data)
+
+    def archive_batch(self) -> int:
+        """Archivia (o elimina) un batch di record, ritorna quanti ne ha rimossi"""
+        cutoff = datetime.now(timezone.utc) - timedelta(days=self.config.RETENTION_DAYS)
+        records = self.db_manager.get_archivable_records(
+            cutoff.isoformat(), self.config.RETENTION_BATCH_SIZE
+        )
+        if not records:
+            return 0
+
+        # Prima scrive l'archivio, poi elimina: in caso di crash un batch può
+        # risultare archiviato due volte (deduplicato in lettura) o troncato
+        # (saltato in lettura; i record sono ancora nel DB e verranno riscritti)
+        if self.config.RETENTION_MODE == "archive":
+            self._write_archive(records)
+
+        archived_until = max(
+            (r["stop_time"] for r in records),
+            key=lambda stop: datetime.fromisoformat(stop),
+        )
+        self.db_manager.delete_records((r["id"] for r in records), archived_until)
+        self.db_manager.incremental_vacuum(VACUUM_PAGES_PER_BATCH)
+        return len(records)
+
+    def run_once(self) -> int:
+        """Esegue la retention completa a piccoli batch"""
+        total = 0
+        while True:
+            count = self.archive_batch()
+            total += count
+            if count < self.config.RETENTION_BATCH_SIZE:
+                break
+            time.sleep(BATCH_PAUSE)
+
+        if total:
+            self.db_manager.incremental_vacuum()
+            print(f"[RETENTION] {total} record rimossi ({self.config.RETENTION_MODE})")
+        return total
+
+    def retention_loop(self):
+        """Loop di retention periodica"""
+        if self.config.RETENTION_DAYS <= 0:
+            print("[RETENTION] Disabilitata")
+            return
+
+        while True:
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"[RETENTION ERROR] {e}")
+            time.sleep(self.config.RETENTION_INTERVAL)
+
+    def query_archives(
+        self,
+        start_day: str,
+        end_day: Optional[str] = None,
+        process: Optional[str] = None,
+    ) -> List[Dict]:
+        """Legge dagli archivi i record iniziati tra due giorni locali inclusi"""
+        first = date.fromisoformat(start_day)
+        last = date.fromisoformat(end_day or start_day)
+
+        # I file sono per mese UTC: allarga di un giorno per i fusi orari
+        months = set()
+        day = first - timedelta(days=1)
+        while day <= last + timedelta(days=1):
+            months.add(day.isoformat()[:7])
+            day += timedelta(days=1)
+
+        results: Dict[int, Dict] = {}
+        for month in sorted(months):
+            path = self._archive_path(month)
+            if not os.path.exists(path):
+                continue
+            for line in self._read_archive(path):
+                record = json.loads(line)
+                if process and record["process"] != process:
+                    continue
+                started = datetime.fromisoformat(record["start_time"])
+                if first <= started.astimezone().date() <= last:
+                    results[record["id"]] = record
+
+        return sorted(results.values(), key=lambda r: r["start_time"])
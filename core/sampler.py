@@ -0,0 +1,126 @@
+"""Campionamento risorse del processo in primo piano"""
+
+import threading
+import time
+from array import array
+from typing import Dict, Optional
+
+import psutil
+
+# Handle psutil.Process tenuti in cache (i più vecchi vengono scartati)
+MAX_CACHED_PROCESSES = 64
+# Massimo rallentamento del campionamento quando si supera il budget
+MAX_BACKOFF = 8
+
+# Indici dell'array di aggregati di sessione
+_COUNT, _CPU_SUM, _CPU_MAX, _RSS_SUM, _RSS_MAX = range(5)
+
+
+class ResourceSampler:
+    """Campiona CPU/RSS del processo in primo piano a frequenza fissa
+
+    Il PID viene impostato dal tracker a ogni cambio di finestra con `switch`,
+    che ritorna gli aggregati (media/massimo) della sessione appena chiusa.
+    """
+
+    def __init__(self, interval: float = 1.0, cpu_budget: float = 0.01):
+        self.base_interval = interval
+        self.interval = interval
+        self.cpu_budget = cpu_budget
+        self.overhead = 0.0  # frazione di un core usata dal campionamento
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._stats = array("d", bytes(5 * 8))
+        self._processes: Dict[int, psutil.Process] = {}
+
+    def switch(self, pid: Optional[int]) -> Optional[Dict[str, float]]:
+        """Inizia una nuova sessione sul PID e ritorna gli aggregati della precedente"""
+        with self._lock:
+            stats, self._stats = self._stats, array("d", bytes(5 * 8))
+            self._pid = pid
+
+        count = stats[_COUNT]
+        if not count:
+            return None
+
+        return {
+            "cpu_mean": stats[_CPU_SUM] / count,
+            "cpu_max": stats[_CPU_MAX],
+            "rss_mean": int(stats[_RSS_SUM] / count),
+            "rss_max": int(stats[_RSS_MAX]),
+        }
+
+    def _get_process(self, pid: int) -> Optional[psutil.Process]:
+        """Ritorna l'handle in cache per il PID
+
+        Alla prima richiesta crea l'handle e ritorna None: la prima lettura di
+        cpu_percent serve solo a inizializzarlo.
+        """
+        proc = self._processes.get(pid)
+        if proc is not None:
+            return proc
+
+        try:
+            proc = psutil.Process(pid)
+            proc.cpu_percent(interval=None)
+        except psutil.Error:
+            return None
+
+        if len(self._processes) >= MAX_CACHED_PROCESSES:
+            del self._processes[next(iter(self._processes))]
+        self._processes[pid] = proc
+        return None
+
+    def sample(self):
+        """Esegue un campionamento del processo corrente"""
+        pid = self._pid
+        if pid is None:
+            return
+
+        proc = self._get_process(pid)
+        if proc is None:
+            return
+
+        try:
+            with proc.oneshot():
+                cpu = proc.cpu_percent(interval=None)
+                rss = proc.memory_info().rss
+        except psutil.Error:
+            self._processes.pop(pid, None)
+            return
+
+        with self._lock:
+            if self._pid != pid:
+                return
+            stats = self._stats
+            stats[_COUNT] += 1
+            stats[_CPU_SUM] += cpu
+            stats[_RSS_SUM] += rss
+            if cpu > stats[_CPU_MAX]:
+                stats[_CPU_MAX] = cpu
+            if rss > stats[_RSS_MAX]:
+                stats[_RSS_MAX] = rss
+
+    def _adjust_interval(self, cost: float):
+        """Rallenta il campionamento se il costo supera il budget"""
+        self.overhead = 0.9 * self.overhead + 0.1 * (cost / self.interval)
+
+        max_interval = self.base_interval * MAX_BACKOFF
+        if self.overhead > self.cpu_budget and self.interval < max_interval:
+            self.interval = min(self.interval * 2, max_interval)
+            print(
+                f"[SAMPLER] Overhead {self.overhead:.2%}, intervallo {self.interval}s"
+            )
+        elif self.overhead < self.cpu_budget / 4 and self.interval > self.base_interval:
+            self.interval = max(self.interval / 2, self.base_interval)
+
+    def sampling_loop(self):
+        """Loop di campionamento periodico"""
+        while True:
+            try:
+                start = time.thread_time()
+                self.sample()
+                self._adjust_interval(time.thread_time() - start)
+            except Exception as e:
+                print(f"[SAMPLER ERROR] {e}")
+            time.sleep(self.interval)
@@ -0,0 +1,160 @@
+"""Profilo dell'avvio: fasi e tempi di import (come `python -X importtime`)
+
+Funziona anche nel binario PyInstaller, dove `-X importtime` non è
+disponibile. Si attiva con `--profile-startup` oppure con la variabile
+d'ambiente AGENT_TRACKER_PROFILE_STARTUP=1; il report va su stderr o, se
+stderr non esiste (build Windows con `-w`), in REPORT_FILE.
+"""
+
+import os
+import sys
+import threading
+import time
+from importlib.abc import Loader, MetaPathFinder
+from typing import List, Tuple
+
+_START = time.perf_counter()
+
+# Destinazione del report quando il processo non ha stderr
+REPORT_FILE = os.path.join(os.path.expanduser("~"), "agent-tracker-startup.log")
+
+
+class _TimedLoader(Loader):
+    """Delega al loader originale misurando `exec_module`
+
+    Un proxy per spec: i loader condivisi tra moduli (zipimport, FrozenImporter
+    di PyInstaller) non vengono modificati. A import concluso la spec torna a
+    puntare al loader originale.
+    """
+
+    def __init__(self, loader, timer: "ImportTimer", name: str):
+        self._loader = loader
+        self._timer = timer
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+    def create_module(self, spec):
+        create_module = getattr(self._loader, "create_module", None)
+        return create_module(spec) if create_module else None
+
+    def exec_module(self, module):
+        try:
+            self._timer.timed(self._name, self._loader.exec_module, module)
+        finally:
+            if getattr(module, "__spec__", None) is not None:
+                module.__spec__.loader = self._loader
+            if getattr(module, "__loader__", None) is self:
+                module.__loader__ = self._loader
+
+
+class ImportTimer(MetaPathFinder):
+    """Misura il tempo di esecuzione di ogni modulo importato
+
+    Non trova moduli: interroga gli altri finder e sostituisce il loader
+    della spec restituita con un proxy che misura `exec_module`. I moduli
+    builtin/frozen della libreria standard (loader senza istanza) e i loader
+    senza `exec_module` non vengono misurati.
+    """
+
+    def __init__(self):
+        # (modulo, self µs, cumulativo µs, profondità) in ordine di completamento
+        self.records: List[Tuple[str, int, int, int]] = []
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            loader = spec.loader
+            if (
+                loader is not None
+                and not isinstance(loader, (type, _TimedLoader))
+                and hasattr(loader, "exec_module")
+            ):
+                spec.loader = _TimedLoader(loader, self, fullname)
+            return spec
+        return None
+
+    def timed(self, name, exec_module, module):
+        """Esegue il modulo registrando tempo proprio e cumulativo"""
+        stack = self._local.__dict__.setdefault("stack", [])
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            exec_module(module)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            self.records.append(
+                (
+                    name,
+                    int((elapsed - children) * 1e6),
+                    int(elapsed * 1e6),
+                    len(stack),
+                )
+            )
+
+
+_timer = None
+_phases: List[Tuple[str, float]] = []
+
+
+def enabled() -> bool:
+    """Profilo richiesto da riga di comando o variabile d'ambiente"""
+    return "--profile-startup" in sys.argv or os.getenv(
+        "AGENT_TRACKER_PROFILE_STARTUP", ""
+    ).lower() in ("1", "true")
+
+
+def install():
+    """Installa il misuratore degli import (va chiamato prima degli altri import)"""
+    global _timer
+    if _timer is None:
+        _timer = ImportTimer()
+        sys.meta_path.insert(0, _timer)
+
+
+def mark(phase: str):
+    """Registra la fine di una fase di avvio"""
+    _phases.append((phase, time.perf_counter() - _START))
+
+
+def report(top: int = 15):
+    """Stampa su stderr (o in REPORT_FILE) tempi di import e fasi di avvio"""
+    if sys.stderr is None:
+        with open(REPORT_FILE, "w", encoding="utf-8") as out:
+            _write_report(out, top)
+    else:
+        _write_report(sys.stderr, top)
+
+
+def _write_report(out, top: int):
+    if _timer is not None:
+        print("import time: self [us] | cumulative | imported package", file=out)
+        for name, self_us, cumulative_us, depth in _timer.records:
+            print(
+                f"import time: {self_us:>9} | {cumulative_us:>10} | "
+                f"{'  ' * depth}{name}",
+                file=out,
+            )
+
+        print(f"[STARTUP] Import più lenti (top {top}, cumulativo):", file=out)
+        top_level = [r for r in _timer.records if r[3] == 0]
+        for name, _, cumulative_us, _ in sorted(top_level, key=lambda r: -r[2])[:top]:
+            print(f"[STARTUP] {cumulative_us / 1000:8.1f} ms  {name}", file=out)
+
+    previous = 0.0
+    for phase, elapsed in _phases:
+        print(
+            f"[STARTUP] {elapsed * 1000:8.1f} ms  (+{(elapsed - previous) * 1000:.1f})"
+            f"  {phase}",
+            file=out,
+        )
+        previous = elapsed
@@ -2,12 +2,16 @@
 
 import time
 import psutil
-from pynput import mouse, keyboard
+from typing import TYPE_CHECKING, Callable, Optional
 from core.database import DatabaseManager
-from core.mongo_sync import MongoSyncManager
 from core.window_detector import WindowDetector
+from core.sampler import ResourceSampler
+from core.input_monitor import InputMonitor
 from config.settings import Config
 
+if TYPE_CHECKING:
+    from core.mongo_sync import MongoSyncManager
+
 
 class ActivityTracker:
     """Traccia l'attività dell'utente"""
@@ -16,55 +20,67 @@ class ActivityTracker:
         self,
         config: Config,
         db_manager: DatabaseManager,
-        mongo_manager: MongoSyncManager,
+        mongo_manager: "MongoSyncManager",
+        sampler: Optional[ResourceSampler] = None,
+        on_focus: Optional[Callable[[str, str], None]] = None,
     ):
         self.config = config
         self.db_manager = db_manager
         self.mongo_manager = mongo_manager
-        self._last_input_time = time.time()
+        self.sampler = sampler
+        self.on_focus = on_focus
         self._paused = False
         self._last_window = None
         self._last_process = None
-        self._init_input_listeners()
-
-    def _init_input_listeners(self):
-        """Inizializza i listener per mouse e tastiera"""
-        mouse.Listener(
-            on_move=self._on_input_activity,
-            on_click=self._on_input_activity,
-            on_scroll=self._on_input_activity,
-        ).start()
-        keyboard.Listener(on_press=self._on_input_activity).start()
-
-    def _on_input_activity(self, *args, **kwargs):
-        """Callback per attività input"""
-        self._last_input_time = time.time()
+        self.input_monitor = InputMonitor(
+            config.INPUT_THROTTLE_MS / 1000, config.INPUT_COUNTS
+        )
+        self.input_monitor.start()
 
     def is_user_active(self) -> bool:
         """Verifica se l'utente è attivo"""
-        elapsed = time.time() - self._last_input_time
-        return elapsed < self.config.INACTIVITY_THRESHOLD
+        self.input_monitor.poll_pointer()
+        return self.input_monitor.idle_seconds() < self.config.INACTIVITY_THRESHOLD
 
-    def track_event(self, process_name: str, window_title: str):
+    def track_event(
+        self, process_name: str, window_title: str, pid: Optional[int] = None
+    ):
         """Registra un evento di attività"""
         try:
+            # Metriche della sessione che viene chiusa
+            closed_stats = {}
+            if self.sampler:
+                closed_stats.update(self.sampler.switch(pid) or {})
+            if self.input_monitor.count_events:
+                closed_stats.update(self.input_monitor.take_counts())
+
             self.db_manager.insert_activity(
                 process_name,
                 window_title,
                 psutil.cpu_percent(interval=None),
                 self.config.DEVICE_ID,
                 self.config.USERNAME,
+                closed_stats,
             )
 
+            if self.on_focus:
+                self.on_focus(process_name, window_title)
+
             print(f"[TRACK] {process_name} - {window_title}")
         except Exception as e:
             print(f"[TRACK ERROR] {e}")
 
     def tracking_loop(self):
         """Loop principale di tracking"""
+        # Attività lasciate aperte da un'esecuzione precedente (crash, spegnimento)
+        closed = self.db_manager.close_open_activities(self.config.TRACKING_INTERVAL)
+        if closed:
+            print(f"[TRACK] {closed} attività della sessione precedente chiuse")
 
         while True:
             try:
+                self.db_manager.touch_open_activity()
+
                 # Gestione pausa per inattività
                 if not self.is_user_active():
                     if not self._paused:
@@ -79,7 +95,9 @@ class ActivityTracker:
                     self.track_event("[RESUME]", "[RESUME]")
 
                 # Rileva finestra attiva
-                process_name, window_title = WindowDetector.get_active_window()
+                process_name, window_title, pid = (
+                    WindowDetector.get_active_window_info()
+                )
 
                 # Ignora processi blacklist
                 if process_name in self.config.PROCESS_BLACKLIST or not window_title:
@@ -91,7 +109,7 @@ class ActivityTracker:
                     window_title != self._last_window
                     or process_name != self._last_process
                 ):
-                    self.track_event(process_name, window_title)
+                    self.track_event(process_name, window_title, pid)
                     self._last_window = window_title
                     self._last_process = process_name
 
@@ -105,12 +123,17 @@ class ActivityTracker:
         """Loop di sincronizzazione periodica"""
         print("[SYNC] Loop avviato...")
 
+        # Sincronizza device
+        self.mongo_manager.sync_device()
+        install_id = self.db_manager.get_install_id()
+
         while True:
             time.sleep(self.config.SYNC_INTERVAL)
             try:
                 records = self.db_manager.get_unsynced_records()
                 if records:
-                    self.mongo_manager.sync_activities(records)
-                    self.db_manager.mark_as_synced()
+                    synced_ids = self.mongo_manager.sync_activities(records, install_id)
+                    open_ids = [r[0] for r in records if r[2] is None]
+                    self.db_manager.mark_as_synced(synced_ids, open_ids)
             except Exception as e:
                 print(f"[SYNC ERROR] {e}")
@@ -14,6 +14,14 @@ class WindowDetector:
     @staticmethod
     def get_active_window() -> Tuple[str, str]:
         """Ritorna (process_name, window_title)"""
+        return WindowDetector.get_active_window_info()[:2]
+
+    @staticmethod
+    def get_active_window_info() -> Tuple[str, str, Optional[int]]:
+        """Ritorna (process_name, window_title, pid) con un solo rilevamento
+
+        Il PID è None se non rilevabile.
+        """
         system = platform.system()
 
         if system == "Darwin":
@@ -23,23 +31,25 @@ class WindowDetector:
         elif system == "Linux":
             return WindowDetector._get_linux_window()
         else:
-            return "unknown", "Unknown"
+            return "unknown", "Unknown", None
 
     @staticmethod
-    def _get_macos_window() -> Tuple[str, str]:
+    def _get_macos_window() -> Tuple[str, str, Optional[int]]:
         """Rileva finestra attiva su macOS"""
-        app_name, window_title = "unknown", "Unknown"
+        app_name, window_title, pid = "unknown", "Unknown", None
 
         try:
             script = """
                 tell application "System Events"
                     set frontApp to first application process whose frontmost is true
                     set bundleID to bundle identifier of frontApp
-                    return bundleID
+                    return bundleID & linefeed & (unix id of frontApp)
                 end tell
             """
             result = subprocess.check_output(["osascript", "-e", script])
-            app_name = WindowDetector.normalize_app_name(result.decode("utf-8").strip())
+            bundle_id, _, unix_id = result.decode("utf-8").strip().partition("\n")
+            pid = int(unix_id) if unix_id.strip().isdigit() else None
+            app_name = WindowDetector.normalize_app_name(bundle_id)
             window_title = app_name
 
             # Gestione browser
@@ -54,7 +64,7 @@ class WindowDetector:
         except Exception as e:
             print(f"[WARN] macOS detection failed: {e}")
 
-        return app_name, window_title
+        return app_name, window_title, pid
 
     @staticmethod
     def normalize_app_name(raw: str) -> str:
@@ -102,7 +112,7 @@ class WindowDetector:
             return None
 
     @staticmethod
-    def _get_windows_window() -> Tuple[str, str]:
+    def _get_windows_window() -> Tuple[str, str, Optional[int]]:
         """Rileva finestra attiva su Windows"""
         try:
             import win32gui  # type: ignore
@@ -110,7 +120,7 @@ class WindowDetector:
 
             hwnd = win32gui.GetForegroundWindow()
             if not hwnd:
-                return "unknown", "Unknown"
+                return "unknown", "Unknown", None
 
             _, pid = win32process.GetWindowThreadProcessId(hwnd)
             proc = psutil.Process(pid)
@@ -130,14 +140,14 @@ class WindowDetector:
                 if match:
                     window_title = match.group(1)
 
-            return app_name, window_title
+            return app_name, window_title, pid
 
         except Exception as e:
             print(f"[WARN] Windows detection failed: {e}")
-            return "unknown", "Unknown"
+            return "unknown", "Unknown", None
 
     @staticmethod
-    def _get_linux_window() -> Tuple[str, str]:
+    def _get_linux_window() -> Tuple[str, str, Optional[int]]:
         """Rileva finestra attiva su Linux"""
         try:
             # Ottiene ID finestra attiva
@@ -159,16 +169,24 @@ class WindowDetector:
             )
             window_title = WindowDetector.normalize_app_name(window_title)
 
-            # Nome app
-            app_name = (
+            # Nome app e PID con la stessa chiamata a xprop
+            properties = (
                 subprocess.check_output(
-                    ["xprop", "-id", win_id, "WM_CLASS"], stderr=subprocess.DEVNULL
+                    ["xprop", "-id", win_id, "WM_CLASS", "_NET_WM_PID"],
+                    stderr=subprocess.DEVNULL,
                 )
                 .decode()
                 .strip()
             )
+            app_name = next(
+                (p for p in properties.splitlines() if p.startswith("WM_CLASS")), ""
+            )
             app_name = WindowDetector.normalize_app_name(app_name)
 
+            # xprop ritorna tipo: _NET_WM_PID(CARDINAL) = 1234
+            match = re.search(r"_NET_WM_PID\(CARDINAL\) = (\d+)", properties)
+            pid = int(match.group(1)) if match else None
+
             # xprop ritorna tipo: WM_CLASS(STRING) = "code", "Code"
             match = re.search(r'"([^"]+)",\s*"([^"]+)"', app_name)
             app_name = match.group(2) if match else "unknown"
@@ -183,8 +201,8 @@ class WindowDetector:
                 if match:
                     window_title = match.group(1)
 
-            return app_name, window_title
+            return app_name, window_title, pid
 
         except Exception as e:
             print(f"[WARN] Linux detection failed: {e}")
-            return "unknown", "Unknown"
+            return "unknown", "Unknown", None
@@ -1,29 +1,47 @@
 """Interfaccia grafica Tkinter"""
 
-import threading
 import tkinter as tk
 from tkinter import ttk
-from typing import Dict
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
 from typing import cast
 from concurrent.futures import ThreadPoolExecutor
 
-from core.mongo_sync import MongoSyncManager
 from core.window_detector import WindowDetector
 from config.settings import Config
 
+if TYPE_CHECKING:
+    from core.mongo_sync import MongoSyncManager
 
-class GUIManager:
-    """Gestisce l'interfaccia grafica Tkinter"""
 
-    def __init__(self, config: Config, mongo_manager: MongoSyncManager):
+class GUIManager:
+    """Gestisce l'interfaccia grafica Tkinter
+
+    Le applicazioni sono mostrate a pagine di `GUI_MAX_ROWS` righe, dalla più
+    recente: i widget di una pagina vengono riutilizzati cambiando pagina, così
+    il loro numero resta limitato senza nascondere le applicazioni più vecchie.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        mongo_manager: "MongoSyncManager",
+        get_active_window: Optional[Callable[[], Tuple[str, str]]] = None,
+    ):
+        """`mongo_manager` può essere anche un IPCClient collegato al daemon"""
         self.config = config
         self.mongo_manager = mongo_manager
+        self.get_active_window = get_active_window or WindowDetector.get_active_window
+        self.apps: List[Dict] = []
+        self._apps_by_id: Dict = {}
+        self._rows: List[Dict] = []
+        self._page = 0
         self.indicators = {}
         self.executor = ThreadPoolExecutor(max_workers=2)
         self._last_timer = {}
+        self._active_id = None
+        self._toast = None
+        self._toast_timer = None
         self.root = None
-        self.root = tk.Tk()
-        self.root.withdraw()
 
     def create_window(self):
         """Crea la finestra principale"""
@@ -69,8 +87,20 @@ class GUIManager:
             ),
         ).pack(side="left", padx=10)
 
+        # === PAGINAZIONE ===
+        frame_pages = tk.Frame(self.root, bg="white")
+        frame_pages.grid(row=1, column=0, columnspan=3, pady=(0, 5))
+        tk.Button(
+            frame_pages, text="◀", relief="flat", command=lambda: self._go_to_page(-1)
+        ).pack(side="left")
+        self._page_label = tk.Label(frame_pages, bg="white", font=("Arial", 10))
+        self._page_label.pack(side="left", padx=10)
+        tk.Button(
+            frame_pages, text="▶", relief="flat", command=lambda: self._go_to_page(1)
+        ).pack(side="left")
+
         # Carica applicazioni
-        self._load_apps(1)
+        self._load_apps()
 
         # Avvia aggiornamento indicatori
         self._update_active_indicator()
@@ -78,24 +108,28 @@ class GUIManager:
         return self.root
 
     def show_toast(self, message, duration=2000):
-        # Se esiste già un toast vecchio lo rimuoviamo
-        if hasattr(self, "_toast") and self._toast:
-            self._toast.destroy()
-
-        # Creiamo il toast dentro lo stesso frame del pulsante
-        self._toast = tk.Label(
-            self.frame_title,  # <-- QUI CAMBIATO
-            text=message,
-            bg="white",
-            fg="green",
-            font=("Arial", 12, "bold"),
-        )
+        # Un solo toast riutilizzato, nascosto allo scadere dell'ultimo timer
+        if self._toast is None:
+            self._toast = tk.Label(
+                self.frame_title,
+                bg="white",
+                fg="green",
+                font=("Arial", 12, "bold"),
+            )
+        if self._toast_timer:
+            cast(tk.Tk, self.root).after_cancel(self._toast_timer)
 
         # Mettilo alla destra del pulsante
+        self._toast.config(text=message)
         self._toast.pack(side="left", padx=10)
 
         # Auto-hide
-        cast(tk.Tk, self.root).after(duration, lambda: self._toast.destroy())
+        self._toast_timer = cast(tk.Tk, self.root).after(duration, self._hide_toast)
+
+    def _hide_toast(self):
+        self._toast_timer = None
+        if self._toast is not None:
+            self._toast.pack_forget()
 
     def copy_to_clipboard(self, widget, text):
         widget.clipboard_clear()
@@ -103,79 +137,142 @@ class GUIManager:
         widget.update()
         self.show_toast("Device ID copiato negli appunti")
 
-    def _load_apps(self, start_row):
-        apps = self.mongo_manager.get_process_windows()
-        for i, app in enumerate(apps, start=start_row):
+    def _load_apps(self):
+        for app in self.mongo_manager.get_process_windows():
             if app["process"] not in self.config.PROCESS_BLACKLIST:
-                self.add_process_row(i, app)
+                self._register_app(app)
+        self._render_page()
+
+    def _register_app(self, app: Dict) -> bool:
+        """Aggiunge un'applicazione ai dati, ritorna False se già presente"""
+        if app["_id"] in self._apps_by_id:
+            return False
+        self._apps_by_id[app["_id"]] = app
+        self.apps.append(app)
+        return True
+
+    def add_process(self, app: Dict):
+        """Aggiunge un processo appena sincronizzato (in cima alla prima pagina)"""
+        if not self.root:
+            return
+        self.root.after(0, lambda: self._add_app(app))
+
+    def _add_app(self, app: Dict):
+        if self._register_app(app):
+            self._render_page()
+
+    def _page_count(self) -> int:
+        return max(1, -(-len(self.apps) // self.config.GUI_MAX_ROWS))
+
+    def _go_to_page(self, step: int):
+        page = min(max(self._page + step, 0), self._page_count() - 1)
+        if page != self._page:
+            self._page = page
+            self._render_page()
+
+    def _render_page(self):
+        """Mostra la pagina corrente riconfigurando le righe esistenti"""
+        per_page = self.config.GUI_MAX_ROWS
+        self._page = min(self._page, self._page_count() - 1)
+        end = len(self.apps) - self._page * per_page
+        visible = self.apps[max(0, end - per_page) : end][::-1]
 
-    def add_process_row(self, row: int, app: Dict):
-        """Aggiunge una riga per un processo"""
-        if app["_id"] in self.indicators:
-            return  # già presente, esci
-
-        level = app.get("level", 5)
-
-        # Indicatore stato
-        indicator = tk.Label(
-            self.root, text="●", fg="gray", bg="white", font=("Arial", 12)
-        )
-        indicator.grid(row=row, column=0, padx=5, pady=3, sticky="w")
-
-        # Nome applicazione
-        label = tk.Label(
-            self.root,
-            text=f"{app['process']} ({app['window_title']})",
-            bg="white",
-            fg="black",
-            font=("Arial", 10),
-        )
-        label.grid(row=row, column=1, sticky="w", padx=5, pady=3)
-
-        # Slider livello
-        scale = ttk.Scale(self.root, from_=1, to=10, orient="horizontal", length=150)
-        scale.set(level)
-        scale.grid(row=row, column=2, padx=10, pady=3)
-        scale.bind(
-            "<ButtonRelease-1>", lambda e, aid=app["_id"]: self._on_level_change(e, aid)
-        )
-
-        self.indicators[app["_id"]] = {
-            "indicator": indicator,
-            "label": label,
+        self.indicators = {}
+        for slot, app in enumerate(visible):
+            self._show_row(slot, app)
+        for row in self._rows[len(visible) :]:
+            for key in ("indicator", "label", "scale"):
+                row[key].grid_remove()
+
+        self._page_label.config(text=f"Pagina {self._page + 1}/{self._page_count()}")
+
+    def _show_row(self, slot: int, app: Dict):
+        """Mostra un'applicazione nella riga `slot`, creandola se serve"""
+        if slot == len(self._rows):
+            row = slot + 2
+
+            # Indicatore stato
+            indicator = tk.Label(
+                self.root, text="●", fg="gray", bg="white", font=("Arial", 12)
+            )
+            indicator.grid(row=row, column=0, padx=5, pady=3, sticky="w")
+
+            # Nome applicazione
+            label = tk.Label(self.root, bg="white", font=("Arial", 10))
+            label.grid(row=row, column=1, sticky="w", padx=5, pady=3)
+
+            # Slider livello
+            scale = ttk.Scale(
+                self.root, from_=1, to=10, orient="horizontal", length=150
+            )
+            scale.grid(row=row, column=2, padx=10, pady=3)
+            self._rows.append({"indicator": indicator, "label": label, "scale": scale})
+
+        data = {
+            **self._rows[slot],
             "process": app["process"],
             "window_title": app["window_title"],
         }
+        for key in ("indicator", "label", "scale"):
+            data[key].grid()
+        data["label"].config(text=f"{app['process']} ({app['window_title']})")
+        data["scale"].set(app.get("level", 5))
+        data["scale"].bind(
+            "<ButtonRelease-1>", lambda e, aid=app["_id"]: self._on_level_change(e, aid)
+        )
+
+        self.indicators[app["_id"]] = data
+        self._set_row_active(app["_id"], app["_id"] == self._active_id)
 
     def _on_level_change(self, event, app_id):
-        """Callback per cambio livello"""
+        """Callback per cambio livello (debounce di 300 ms)"""
         level = int(float(event.widget.get()))
+        if app_id in self._apps_by_id:
+            self._apps_by_id[app_id]["level"] = level
 
         if app_id in self._last_timer:
-            self._last_timer[app_id].cancel()
+            cast(tk.Tk, self.root).after_cancel(self._last_timer[app_id])
 
-        self._last_timer[app_id] = threading.Timer(
-            0.3, lambda: self.mongo_manager.update_level(app_id, level)
+        self._last_timer[app_id] = cast(tk.Tk, self.root).after(
+            300, lambda: self._submit_level(app_id, level)
         )
-        self._last_timer[app_id].start()
+
+    def _submit_level(self, app_id, level: int):
+        """Invia il livello in background e libera il timer"""
+        self._last_timer.pop(app_id, None)
+        self.executor.submit(self.mongo_manager.update_level, app_id, level)
+
+    def _set_row_active(self, app_id, active: bool):
+        data = self.indicators.get(app_id)
+        if data is None:
+            return
+        if active:
+            data["indicator"].config(fg="green")
+            data["label"].config(fg="green", font=("Arial", 10, "bold"))
+        else:
+            data["indicator"].config(fg="gray")
+            data["label"].config(fg="black", font=("Arial", 10))
 
     def _update_active_indicator(self):
         """Aggiorna gli indicatori per l'app attiva"""
         try:
-            active_process, active_title = WindowDetector.get_active_window()
+            active_process, active_title = self.get_active_window()
 
-            for data in self.indicators.values():
-                is_active = (
-                    data["process"] == active_process
+            active_id = next(
+                (
+                    app_id
+                    for app_id, data in self.indicators.items()
+                    if data["process"] == active_process
                     and data["window_title"] == active_title
-                )
-
-                if is_active:
-                    data["indicator"].config(fg="green")
-                    data["label"].config(fg="green", font=("Arial", 10, "bold"))
-                else:
-                    data["indicator"].config(fg="gray")
-                    data["label"].config(fg="black", font=("Arial", 10))
+                ),
+                None,
+            )
+
+            # Riconfigura solo le righe che cambiano stato
+            if active_id != self._active_id:
+                self._set_row_active(self._active_id, False)
+                self._set_row_active(active_id, True)
+                self._active_id = active_id
         except Exception as e:
             print(f"[UI UPDATE ERROR] {e}")
         finally:
@@ -1,43 +1,164 @@
 #!/usr/bin/env python3
 """
 Activity Tracker - Entry point principale
+
+Modalità:
+    python main.py              # tracking, sync e GUI in un unico processo
+    python main.py --headless   # daemon: tracking e sync, GUI collegabile via IPC
+    python main.py --attach     # GUI collegata a un daemon già avviato
+
+Opzioni di avvio:
+    --profile-startup           # report su stderr di fasi e tempi di import
+    --startup-check             # esce appena il tracking è avviato, senza sync
+                                #   né retention (benchmark)
 """
+import sys
+from core import startup
+
+# Il misuratore deve precedere tutti gli altri import
+if startup.enabled():
+    startup.install()
+
+import argparse
 import threading
+import time
 from config.settings import config
 from core.database import DatabaseManager
-from core.mongo_sync import MongoSyncManager
-from core.tracker import ActivityTracker
-from gui.manager import GUIManager
 
+startup.mark("import base")
 
-def main():
-    """Entry point principale"""
-    print("=" * 60)
-    print("🔍 ACTIVITY TRACKER")
-    print("=" * 60)
 
-    # Inizializza componenti
-    db_manager = DatabaseManager(config.DB_PATH)
-    mongo_manager = MongoSyncManager(config)
-    gui_manager = GUIManager(config, mongo_manager)
-    mongo_manager = MongoSyncManager(config, gui_manager)
-    tracker = ActivityTracker(config, db_manager, mongo_manager)
+def start_background(db_manager, mongo_manager, on_focus=None, sync=True):
+    """Avvia tracking, sync, retention e campionamento in background
+
+    Con `sync=False` (--startup-check) sync e retention non partono: il
+    benchmark non contatta MongoDB e non archivia dati.
+    """
+    from core.retention import RetentionManager
+    from core.sampler import ResourceSampler
+    from core.tracker import ActivityTracker
 
-    # Sincronizza device
-    mongo_manager.sync_device()
+    sampler = ResourceSampler(config.SAMPLE_INTERVAL, config.SAMPLER_CPU_BUDGET)
+    tracker = ActivityTracker(config, db_manager, mongo_manager, sampler, on_focus)
+    retention = RetentionManager(config, db_manager)
+    startup.mark("tracker inizializzato")
 
-    # Avvia thread background
+    # Avvia thread background (il sync del device avviene nel loop di sync)
     threading.Thread(target=tracker.tracking_loop, daemon=True).start()
-    threading.Thread(target=tracker.sync_loop, daemon=True).start()
+    if sync:
+        threading.Thread(target=tracker.sync_loop, daemon=True).start()
+        threading.Thread(target=retention.retention_loop, daemon=True).start()
+    threading.Thread(target=sampler.sampling_loop, daemon=True).start()
+    startup.mark("tracking avviato")
 
     print("[INFO] Tracking avviato. Premi Ctrl+C per fermare.")
     print("=" * 60)
 
+
+def startup_done(args):
+    """Chiude il profilo di avvio ed eventualmente termina (--startup-check)"""
+    startup.mark("pronto")
+    if args.profile_startup or startup.enabled():
+        startup.report()
+    if args.startup_check:
+        sys.exit(0)
+
+
+def run_standalone(args):
+    """Tracking, sync e GUI nello stesso processo"""
+    from core.mongo_sync import MongoSyncManager
+
+    config.validate()
+    db_manager = DatabaseManager(config.DB_PATH)
+    mongo_manager = MongoSyncManager(config)
+    start_background(db_manager, mongo_manager, sync=not args.startup_check)
+
+    from gui.manager import GUIManager
+
+    gui_manager = GUIManager(config, mongo_manager)
+    mongo_manager.gui = gui_manager
+    gui_manager.create_window()
+    startup_done(args)
+
     # Avvia GUI (blocking)
+    gui_manager.run()
+
+
+def run_headless(args):
+    """Daemon senza GUI: tracking e sync, stato esposto sul socket locale"""
+    import signal
+    from core.ipc import IPCServer
+    from core.mongo_sync import MongoSyncManager
+
+    config.validate()
+    # SIGTERM passa da sys.exit: gli handler atexit rimuovono il socket
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    db_manager = DatabaseManager(config.DB_PATH)
+    mongo_manager = MongoSyncManager(config)
+    ipc_server = IPCServer(config, mongo_manager)
+    mongo_manager.gui = ipc_server
+    ipc_server.start()
+    start_background(
+        db_manager,
+        mongo_manager,
+        ipc_server.publish_focus,
+        sync=not args.startup_check,
+    )
+    startup_done(args)
+
+    while True:
+        time.sleep(3600)
+
+
+def run_gui_client(args):
+    """GUI collegata al daemon tramite socket locale"""
+    from core.ipc import IPCClient
+    from gui.manager import GUIManager
+
+    client = IPCClient(config)
+    client.connect()
+    gui_manager = GUIManager(config, client, client.get_active_window)
+    client.gui = gui_manager
+
     gui_manager.create_window()
+    startup_done(args)
     gui_manager.run()
 
 
+def main():
+    """Entry point principale"""
+    parser = argparse.ArgumentParser(description="Activity Tracker")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--headless", action="store_true", help="Avvia il daemon senza GUI"
+    )
+    mode.add_argument(
+        "--attach", action="store_true", help="Avvia la GUI collegata al daemon"
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Stampa fasi e tempi di import dell'avvio",
+    )
+    parser.add_argument(
+        "--startup-check",
+        action="store_true",
+        help="Termina appena l'avvio è completato",
+    )
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🔍 ACTIVITY TRACKER")
+    print("=" * 60)
+
+    if args.headless:
+        run_headless(args)
+    elif args.attach:
+        run_gui_client(args)
+    else:
+        run_standalone(args)
+
+
 if __name__ == "__main__":
     try:
         main()
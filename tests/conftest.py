@@ -0,0 +1,26 @@
+"""Fixture condivise dei test"""
+
+import os
+import time
+
+import pytest
+
+from core.database import DatabaseManager
+
+
+@pytest.fixture
+def local_tz(monkeypatch):
+    """Imposta il fuso orario locale del processo (ripristinato a fine test)"""
+
+    def set_tz(name: str):
+        monkeypatch.setenv("TZ", name)
+        time.tzset()
+
+    yield set_tz
+    monkeypatch.undo()
+    time.tzset()
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    return DatabaseManager(os.path.join(tmp_path, "activity.db"))
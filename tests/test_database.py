@@ -0,0 +1,304 @@
+"""Test del database locale e del riepilogo giornaliero"""
+
+import sqlite3
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from core.database import DatabaseManager
+
+
+def utc(value: str) -> datetime:
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+
+
+def insert_closed(db_manager, start: datetime, stop: datetime, process, title):
+    """Inserisce un'attività chiusa e la somma al riepilogo come il tracker"""
+    conn = sqlite3.connect(db_manager.db_path)
+    cur = conn.cursor()
+    cur.execute(
+        """
+        INSERT INTO activity (start_time, stop_time, process, window_title, synced)
+        VALUES (?, ?, ?, ?, 0)
+        """,
+        (start.isoformat(), stop.isoformat(), process, title),
+    )
+    db_manager._add_to_daily_summary(
+        cur, start.isoformat(), stop.isoformat(), process, title
+    )
+    conn.commit()
+    conn.close()
+
+
+def all_rows(db_manager, query: str):
+    conn = sqlite3.connect(db_manager.db_path)
+    try:
+        return conn.execute(query).fetchall()
+    finally:
+        conn.close()
+
+
+# === Suddivisione per giorno ===
+
+
+def test_split_by_day_single_day(local_tz):
+    local_tz("UTC")
+    parts = list(
+        DatabaseManager._split_by_day(
+            utc("2026-05-10T09:00:00"), utc("2026-05-10T10:30:00")
+        )
+    )
+    assert parts == [("2026-05-10", 5400.0)]
+
+
+def test_split_by_day_at_local_midnight(local_tz):
+    local_tz("Europe/Rome")
+    # 21:30Z = 23:30 a Roma (CEST): 30 minuti il primo giorno, 60 il secondo
+    parts = list(
+        DatabaseManager._split_by_day(
+            utc("2026-05-10T21:30:00"), utc("2026-05-10T23:00:00")
+        )
+    )
+    assert parts == [("2026-05-10", 1800.0), ("2026-05-11", 3600.0)]
+
+
+def test_split_by_day_spring_forward(local_tz):
+    local_tz("Europe/Rome")
+    parts = dict(
+        DatabaseManager._split_by_day(
+            utc("2026-03-28T22:00:00"), utc("2026-03-29T23:30:00")
+        )
+    )
+    # Il 29 marzo dura 23 ore
+    assert parts == {
+        "2026-03-28": 3600.0,
+        "2026-03-29": 23 * 3600.0,
+        "2026-03-30": 5400.0,
+    }
+
+
+def test_split_by_day_fall_back(local_tz):
+    local_tz("Europe/Rome")
+    parts = dict(
+        DatabaseManager._split_by_day(
+            utc("2026-10-24T22:00:00"), utc("2026-10-26T00:00:00")
+        )
+    )
+    # Il 25 ottobre dura 25 ore
+    assert parts == {"2026-10-25": 25 * 3600.0, "2026-10-26": 3600.0}
+
+
+def test_split_by_day_total_matches_interval(local_tz):
+    local_tz("America/New_York")
+    start, stop = utc("2026-03-01T03:17:00"), utc("2026-03-20T19:42:00")
+    parts = list(DatabaseManager._split_by_day(start, stop))
+    assert len(parts) == len({day for day, _ in parts})
+    assert sum(seconds for _, seconds in parts) == (stop - start).total_seconds()
+
+
+# === Riepilogo giornaliero ===
+
+
+def test_insert_activity_closes_previous_and_updates_summary(db_manager):
+    db_manager.insert_activity("editor", "main.py", 0.0, "dev", "user")
+    db_manager.insert_activity(
+        "browser", "docs", 0.0, "dev", "user", {"keystrokes": 12, "bogus": 1}
+    )
+
+    rows = all_rows(
+        db_manager,
+        "SELECT process, stop_time IS NOT NULL, keystrokes FROM activity ORDER BY id",
+    )
+    assert rows == [("editor", 1, 12), ("browser", 0, None)]
+    summary = all_rows(db_manager, "SELECT process FROM activity_daily")
+    assert summary == [("editor",)]
+
+
+def test_rebuild_matches_incremental_summary(db_manager, local_tz):
+    local_tz("Europe/Rome")
+    start = utc("2026-03-27T20:00:00")
+    for i in range(60):
+        stop = start + timedelta(minutes=37 + i % 5 * 11)
+        insert_closed(db_manager, start, stop, f"app{i % 3}", f"titolo {i % 4}")
+        start = stop + timedelta(minutes=3)
+
+    query = "SELECT day, process, window_title, seconds FROM activity_daily ORDER BY 1, 2, 3"
+    incremental = all_rows(db_manager, query)
+    db_manager.rebuild_daily_summary()
+    assert all_rows(db_manager, query) == incremental
+    assert len({row[0] for row in incremental}) > 1
+
+
+def test_get_daily_summary_and_process_totals(db_manager, local_tz):
+    local_tz("UTC")
+    insert_closed(
+        db_manager, utc("2026-05-10T09:00:00"), utc("2026-05-10T10:00:00"), "a", "x"
+    )
+    insert_closed(
+        db_manager, utc("2026-05-10T10:00:00"), utc("2026-05-10T10:30:00"), "a", "y"
+    )
+    insert_closed(
+        db_manager, utc("2026-05-11T09:00:00"), utc("2026-05-11T11:00:00"), "b", "z"
+    )
+
+    assert db_manager.get_daily_summary("2026-05-10") == [
+        ("2026-05-10", "a", "x", 3600.0),
+        ("2026-05-10", "a", "y", 1800.0),
+    ]
+    assert db_manager.get_process_totals("2026-05-10", "2026-05-11") == [
+        ("b", 7200.0),
+        ("a", 5400.0),
+    ]
+
+
+def test_year_of_summary_answers_in_milliseconds(db_manager):
+    # Un anno di riepilogo: 365 giorni × 30 processi × 10 finestre
+    first = date(2025, 1, 1)
+    rows = [
+        ((first + timedelta(days=d)).isoformat(), f"app{p}", f"titolo {t}", 60.0)
+        for d in range(365)
+        for p in range(30)
+        for t in range(10)
+    ]
+    conn = sqlite3.connect(db_manager.db_path)
+    conn.executemany("INSERT INTO activity_daily VALUES (?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+    started = time.perf_counter()
+    day = db_manager.get_daily_summary("2025-06-15")
+    day_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    totals = db_manager.get_process_totals("2025-01-01", "2025-12-31")
+    year_elapsed = time.perf_counter() - started
+
+    assert len(day) == 300
+    assert totals[0][1] == 365 * 10 * 60.0
+    assert day_elapsed < 0.05
+    assert year_elapsed < 0.5
+
+
+def test_existing_db_summary_built_from_history(db_manager, local_tz):
+    local_tz("UTC")
+    insert_closed(
+        db_manager, utc("2026-05-10T09:00:00"), utc("2026-05-10T10:00:00"), "a", "x"
+    )
+    # DB creato prima del riepilogo giornaliero
+    conn = sqlite3.connect(db_manager.db_path)
+    conn.execute("DROP TABLE activity_daily")
+    conn.commit()
+    conn.close()
+
+    reopened = DatabaseManager(db_manager.db_path)
+    assert reopened.get_process_totals("2026-05-10") == [("a", 3600.0)]
+
+
+# === Attività rimaste aperte ===
+
+
+def insert_open(db_manager, start: datetime, last_seen=None):
+    conn = sqlite3.connect(db_manager.db_path)
+    conn.execute(
+        """
+        INSERT INTO activity (start_time, process, window_title, synced, last_seen)
+        VALUES (?, 'editor', 'main', 1, ?)
+        """,
+        (start.isoformat(), last_seen and last_seen.isoformat()),
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_touch_open_activity_updates_only_open_row(db_manager):
+    db_manager.insert_activity("editor", "main", 0.0, "dev", "user")
+    db_manager.insert_activity("browser", "docs", 0.0, "dev", "user")
+    db_manager.touch_open_activity()
+
+    rows = all_rows(db_manager, "SELECT process, last_seen FROM activity ORDER BY id")
+    assert rows[0][1] is None
+    assert rows[1][1] is not None
+
+
+def test_close_open_activities_uses_last_seen(db_manager, local_tz):
+    local_tz("UTC")
+    start = utc("2026-05-10T09:00:00")
+    insert_open(db_manager, start, start + timedelta(hours=2))
+
+    assert db_manager.close_open_activities(grace=30) == 1
+
+    record = db_manager.get_unsynced_records()[0]
+    assert datetime.fromisoformat(record[2]) == start + timedelta(hours=2, seconds=30)
+    assert db_manager.get_process_totals("2026-05-10") == [("editor", 7230.0)]
+
+
+def test_close_open_activities_without_last_seen(db_manager, local_tz):
+    local_tz("UTC")
+    # Record di un DB aggiornato, rimasto aperto per giorni
+    start = utc("2026-05-01T09:00:00")
+    insert_open(db_manager, start)
+
+    db_manager.close_open_activities(grace=30)
+
+    assert db_manager.get_process_totals("2026-05-01", "2026-05-31") == [
+        ("editor", 30.0)
+    ]
+    assert db_manager.close_open_activities(grace=30) == 0
+
+
+def test_close_open_activities_never_in_the_future(db_manager):
+    start = datetime.now(timezone.utc) - timedelta(seconds=5)
+    insert_open(db_manager, start)
+
+    db_manager.close_open_activities(grace=3600)
+
+    stop = datetime.fromisoformat(db_manager.get_unsynced_records()[0][2])
+    assert start <= stop <= datetime.now(timezone.utc)
+
+
+# === Sincronizzazione ===
+
+
+def test_mark_as_synced_only_given_ids(db_manager):
+    for i in range(4):
+        db_manager.insert_activity(f"app{i}", "t", 0.0, "dev", "user")
+    ids = [row[0] for row in db_manager.get_unsynced_records()]
+
+    db_manager.mark_as_synced(ids[:2])
+    assert [row[0] for row in db_manager.get_unsynced_records()] == ids[2:]
+
+    db_manager.mark_as_synced([])
+    assert len(db_manager.get_unsynced_records()) == 2
+
+    db_manager.mark_as_synced()
+    assert db_manager.get_unsynced_records() == []
+
+
+def test_closing_synced_activity_resyncs_stats(db_manager):
+    db_manager.insert_activity("editor", "main.py", 0.0, "dev", "user")
+    records = db_manager.get_unsynced_records()
+    db_manager.mark_as_synced([r[0] for r in records], [records[0][0]])
+    assert db_manager.get_unsynced_records() == []
+
+    db_manager.insert_activity(
+        "browser", "docs", 0.0, "dev", "user", {"cpu_mean": 12.5, "rss_max": 1024}
+    )
+    closed, opened = db_manager.get_unsynced_records()
+    assert closed[0] == records[0][0]
+    assert closed[2] is not None
+    assert (closed[9], closed[12]) == (12.5, 1024)
+    assert opened[2] is None
+
+
+def test_mark_as_synced_keeps_activity_closed_during_sync(db_manager):
+    db_manager.insert_activity("editor", "main.py", 0.0, "dev", "user")
+    records = db_manager.get_unsynced_records()
+
+    # L'attività viene chiusa mentre il sync è in corso
+    db_manager.insert_activity("browser", "docs", 0.0, "dev", "user")
+    db_manager.mark_as_synced([r[0] for r in records], [records[0][0]])
+
+    pending = db_manager.get_unsynced_records()
+    assert [(r[3], r[2] is None) for r in pending] == [
+        ("editor", False),
+        ("browser", True),
+    ]
@@ -0,0 +1,53 @@
+"""Test del monitoraggio input"""
+
+from core.input_monitor import InputMonitor
+
+
+class FakePointer:
+    def __init__(self):
+        self.position = (0, 0)
+
+
+def test_poll_pointer_registers_only_movements():
+    monitor = InputMonitor(throttle=0.1)
+    monitor._pointer = FakePointer()
+    monitor._last_position = (0, 0)
+    monitor.last_input = 0.0
+
+    monitor.poll_pointer()
+    assert monitor.last_input == 0.0
+
+    monitor._pointer.position = (5, 7)
+    monitor.poll_pointer()
+    assert monitor.last_input > 0.0
+
+
+def test_poll_pointer_without_listeners():
+    monitor = InputMonitor()
+    monitor.poll_pointer()
+    assert monitor._last_position is None
+
+
+def test_input_is_throttled():
+    monitor = InputMonitor(throttle=3600)
+    first = monitor.last_input
+    monitor._next_update = 0.0
+
+    monitor._on_input()
+    updated = monitor.last_input
+    monitor._on_input()
+
+    assert updated > first
+    assert monitor.last_input == updated
+
+
+def test_take_counts_returns_deltas():
+    monitor = InputMonitor(count_events=True)
+    for _ in range(3):
+        monitor._on_key("a")
+    monitor._on_click(0, 0, "left", True)
+    monitor._on_click(0, 0, "left", False)
+
+    assert monitor.take_counts() == {"keystrokes": 3, "clicks": 1}
+    monitor._on_key("b")
+    assert monitor.take_counts() == {"keystrokes": 1, "clicks": 0}
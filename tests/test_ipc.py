@@ -0,0 +1,96 @@
+"""Test del socket locale tra daemon e GUI"""
+
+import os
+import socket
+import time
+
+import pytest
+
+from config.settings import Config
+from core.ipc import CLIENT_QUEUE_SIZE, IPCClient, IPCServer
+
+
+class FakeMongo:
+    def __init__(self):
+        self.levels = []
+
+    def get_process_windows(self):
+        return [{"_id": 1, "process": "editor", "window_title": "main", "level": 5}]
+
+    def update_level(self, voce_id, level):
+        self.levels.append((voce_id, level))
+
+
+@pytest.fixture
+def config(tmp_path):
+    config = Config()
+    config.IPC_SOCKET = os.path.join(tmp_path, "ipc.sock")
+    return config
+
+
+@pytest.fixture
+def server(config):
+    server = IPCServer(config, FakeMongo())
+    server.start()
+    yield server
+    server.stop()
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_client_receives_state_and_updates(server, config):
+    server.publish_focus("editor", "main")
+    client = IPCClient(config)
+    client.connect()
+
+    assert client.get_process_windows()[0]["process"] == "editor"
+    wait_for(lambda: client.get_active_window() == ("editor", "main"))
+
+    server.publish_focus("browser", "docs")
+    wait_for(lambda: client.get_active_window() == ("browser", "docs"))
+
+
+def test_start_refuses_live_daemon(server, config):
+    with pytest.raises(RuntimeError):
+        IPCServer(config, FakeMongo()).start()
+    assert os.path.exists(config.IPC_SOCKET)
+
+
+def test_start_replaces_stale_socket(config):
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(config.IPC_SOCKET)
+    stale.close()
+
+    server = IPCServer(config, FakeMongo())
+    server.start()
+    try:
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        probe.connect(config.IPC_SOCKET)
+        probe.close()
+    finally:
+        server.stop()
+
+
+def test_stop_removes_socket(server, config):
+    server.stop()
+    assert not os.path.exists(config.IPC_SOCKET)
+
+
+def test_stalled_client_does_not_block_broadcast(server, config):
+    # GUI bloccata: si collega ma non legge mai
+    stalled = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stalled.connect(config.IPC_SOCKET)
+    wait_for(lambda: len(server._clients) == 1)
+
+    started = time.monotonic()
+    for i in range(CLIENT_QUEUE_SIZE * 20):
+        server.publish_focus("editor", f"titolo {i} " + "x" * 4096)
+    assert time.monotonic() - started < 1.0
+
+    wait_for(lambda: not server._clients)
+    stalled.close()
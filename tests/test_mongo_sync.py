@@ -0,0 +1,125 @@
+"""Test della sincronizzazione con MongoDB (collection simulate)"""
+
+from types import SimpleNamespace
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+from config.settings import Config
+from core.database import DatabaseManager
+from core.mongo_sync import MongoSyncManager
+
+
+class FakeCollection:
+    """Registra i bulk write; `fail` sono gli indici delle scritture che falliscono"""
+
+    def __init__(self):
+        self.bulk_writes = []
+        self.fail = set()
+        self.known = set()
+
+    def create_index(self, *args, **kwargs):
+        pass
+
+    def bulk_write(self, requests, ordered=True):
+        self.bulk_writes.append(len(requests))
+        upserted = {}
+        for index, request in enumerate(requests):
+            key = repr(request._filter)
+            if index not in self.fail and key not in self.known:
+                self.known.add(key)
+                upserted[index] = f"id-{len(self.known)}"
+        if self.fail:
+            raise BulkWriteError(
+                {
+                    "writeErrors": [
+                        {"index": i, "code": 11000, "errmsg": "duplicate key"}
+                        for i in sorted(self.fail)
+                    ],
+                    "upserted": [{"index": i, "_id": v} for i, v in upserted.items()],
+                }
+            )
+        return SimpleNamespace(upserted_ids=upserted)
+
+
+class FakeDB(dict):
+    def __missing__(self, name):
+        self[name] = FakeCollection()
+        return self[name]
+
+
+class FakeGUI:
+    def __init__(self):
+        self.apps = []
+
+    def add_process(self, app):
+        self.apps.append(app)
+
+
+@pytest.fixture
+def manager():
+    config = Config()
+    config.SYNC_BATCH_SIZE = 3
+    config.PROCESS_BLACKLIST = ["[PAUSE]"]
+    manager = MongoSyncManager(config, FakeGUI())
+    manager._db = FakeDB()
+    return manager
+
+
+def records(count, processes=("editor", "browser", "[PAUSE]")):
+    return [
+        (
+            i,
+            f"2026-01-10T08:{i:02d}:00+00:00",
+            f"2026-01-10T08:{i + 1:02d}:00+00:00",
+            processes[i % len(processes)],
+            "titolo",
+            1.0,
+            0,
+            "dev",
+            "user",
+            *([None] * 6),
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def test_sync_returns_all_ids_in_batches(manager):
+    assert manager.sync_activities(records(7), "inst") == list(range(1, 8))
+    logs = manager.db[manager.config.ACTIVITY_LOGS_TABLE]
+    assert logs.bulk_writes == [3, 3, 1]
+
+
+def test_partial_bulk_error_keeps_written_ids(manager):
+    logs = manager.db[manager.config.ACTIVITY_LOGS_TABLE]
+    logs.fail = {1}
+    # Ogni batch da 3 perde il secondo record
+    assert manager.sync_activities(records(6), "inst") == [1, 3, 4, 6]
+
+
+def test_process_windows_in_one_bulk_write(manager):
+    manager.sync_activities(records(9), "inst")
+    windows = manager.db[manager.config.PROCESS_WINDOW_TABLE]
+
+    assert windows.bulk_writes == [2]
+    assert sorted(a["process"] for a in manager.gui.apps) == ["browser", "editor"]
+    assert all(a["level"] == 5 and a["_id"] for a in manager.gui.apps)
+
+    # Al sync successivo le finestre esistono già: nessuna notifica alla GUI
+    manager.sync_activities(records(3), "inst")
+    assert windows.bulk_writes == [2, 2]
+    assert len(manager.gui.apps) == 2
+
+
+def test_same_device_different_databases(manager, tmp_path):
+    # Due utenti dello stesso PC: stesso device_id, id locali sovrapposti
+    first = DatabaseManager(str(tmp_path / "a.db"))
+    second = DatabaseManager(str(tmp_path / "b.db"))
+    assert first.get_install_id() == first.get_install_id()
+    assert first.get_install_id() != second.get_install_id()
+
+    manager.sync_activities(records(2), first.get_install_id())
+    manager.sync_activities(records(2), second.get_install_id())
+
+    logs = manager.db[manager.config.ACTIVITY_LOGS_TABLE]
+    assert len(logs.known) == 4
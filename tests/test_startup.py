@@ -0,0 +1,54 @@
+"""Test del profilo di avvio"""
+
+import sys
+import zipfile
+import zipimport
+
+import pytest
+
+from core import startup
+
+
+@pytest.fixture
+def timer(monkeypatch):
+    timer = startup.ImportTimer()
+    monkeypatch.setattr(sys, "meta_path", [timer, *sys.meta_path])
+    monkeypatch.setattr(startup, "_timer", timer)
+    yield timer
+    for name in ("zm1", "zm2", "zm3"):
+        sys.modules.pop(name, None)
+
+
+def test_modules_from_shared_loader_recorded_once(timer, tmp_path, monkeypatch):
+    archive = tmp_path / "mods.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("zm1.py", "import zm2\n")
+        zf.writestr("zm2.py", "VALUE = 2\n")
+        zf.writestr("zm3.py", "VALUE = 3\n")
+    monkeypatch.syspath_prepend(str(archive))
+
+    import zm1  # noqa: F401
+    import zm3
+
+    names = [record[0] for record in timer.records]
+    assert names.count("zm1") == names.count("zm2") == names.count("zm3") == 1
+    depths = {record[0]: record[3] for record in timer.records}
+    assert depths["zm2"] == depths["zm1"] + 1
+
+    # Dopo l'import la spec punta di nuovo al loader condiviso
+    assert isinstance(zm3.__loader__, zipimport.zipimporter)
+    assert zm3.__spec__.loader is zm3.__loader__
+
+
+def test_report_goes_to_file_without_stderr(timer, tmp_path, monkeypatch):
+    report_file = tmp_path / "startup.log"
+    monkeypatch.setattr(startup, "REPORT_FILE", str(report_file))
+    monkeypatch.setattr(sys, "stderr", None)
+    timer.records.append(("modulo", 10, 20, 0))
+    startup.mark("pronto")
+
+    startup.report()
+
+    text = report_file.read_text(encoding="utf-8")
+    assert "modulo" in text
+    assert "pronto" in text
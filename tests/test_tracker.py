@@ -0,0 +1,42 @@
+"""Test del tracker: metriche di sessione fino ai record da sincronizzare"""
+
+import pytest
+
+from config.settings import Config
+from core.input_monitor import InputMonitor
+from core.tracker import ActivityTracker
+
+
+@pytest.fixture
+def tracker(db_manager, monkeypatch):
+    # Nessun listener reale di tastiera e mouse: gli eventi sono simulati
+    monkeypatch.setattr(InputMonitor, "start", lambda self: None)
+    config = Config()
+    config.INPUT_COUNTS = True
+    return ActivityTracker(config, db_manager, mongo_manager=None)
+
+
+def sync(db_manager):
+    """Simula un giro di sync_loop andato a buon fine"""
+    records = db_manager.get_unsynced_records()
+    db_manager.mark_as_synced(
+        [r[0] for r in records], [r[0] for r in records if r[2] is None]
+    )
+
+
+def test_input_counts_reach_activity_synced_while_open(tracker, db_manager):
+    tracker.track_event("editor", "main")
+    sync(db_manager)
+
+    for _ in range(7):
+        tracker.input_monitor._on_key("a")
+    tracker.input_monitor._on_click(0, 0, "left", True)
+    tracker.input_monitor._on_click(0, 0, "left", False)
+    tracker.track_event("browser", "docs")
+
+    closed = db_manager.get_unsynced_records()[0]
+    assert closed[3] == "editor"
+    assert (closed[13], closed[14]) == (7, 1)
+
+    sync(db_manager)
+    assert db_manager.get_unsynced_records() == []
@@ -0,0 +1,51 @@
+"""Test del rilevamento della finestra attiva"""
+
+import subprocess
+
+from core.window_detector import WindowDetector
+
+
+def fake_xdotool(outputs):
+    """check_output simulato: risponde in base al comando e conta le chiamate"""
+    calls = []
+
+    def check_output(cmd, **kwargs):
+        calls.append(cmd)
+        return outputs[" ".join(cmd[:2])].encode()
+
+    return check_output, calls
+
+
+def test_linux_window_returns_pid_from_same_detection(monkeypatch):
+    check_output, calls = fake_xdotool(
+        {
+            "xdotool getwindowfocus": "0x3a00007\n",
+            "xdotool getwindowname": "main - Visual Studio Code\n",
+            "xprop -id": 'WM_CLASS(STRING) = "code", "Code"\n'
+            "_NET_WM_PID(CARDINAL) = 4242\n",
+        }
+    )
+    monkeypatch.setattr(subprocess, "check_output", check_output)
+    monkeypatch.setattr("platform.system", lambda: "Linux")
+
+    process, title, pid = WindowDetector.get_active_window_info()
+
+    assert (process, pid) == ("Code", 4242)
+    assert title == "main - Visual Studio Code"
+    assert len(calls) == 3
+
+
+def test_linux_window_without_pid(monkeypatch):
+    check_output, _ = fake_xdotool(
+        {
+            "xdotool getwindowfocus": "0x3a00007\n",
+            "xdotool getwindowname": "Terminale\n",
+            "xprop -id": 'WM_CLASS(STRING) = "xterm", "XTerm"\n'
+            "_NET_WM_PID:  not found.\n",
+        }
+    )
+    monkeypatch.setattr(subprocess, "check_output", check_output)
+    monkeypatch.setattr("platform.system", lambda: "Linux")
+
+    assert WindowDetector.get_active_window_info() == ("XTerm", "Terminale", None)
+    assert WindowDetector.get_active_window() == ("XTerm", "Terminale")